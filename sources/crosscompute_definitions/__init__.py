@@ -1 +1,21 @@
+from importlib import import_module
+
+
 __version__ = '0.9.5'
+
+
+def __getattr__(name):
+    if name not in MODULE_NAME_BY_NAME:
+        x = f"module '{__name__}' has no attribute '{name}'"
+        raise AttributeError(x)
+    module = import_module(MODULE_NAME_BY_NAME[name], __name__)
+    value = globals()[name] = getattr(module, name)
+    return value
+
+
+MODULE_NAME_BY_NAME = {
+    'ToolDefinition': '.function.configuration',
+    'load_configuration': '.function.configuration',
+    'load_tool_configuration': '.function.configuration',
+    'load_variable_data': '.function.variable',
+    'load_variable_data_by_id': '.function.variable'}
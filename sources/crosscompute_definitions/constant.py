@@ -11,13 +11,31 @@ class ToolAccess(Enum):
     PUBLIC = 7
 
 
+class DataStatus(Enum):
+    READY = 0
+    MISSING = 1
+    TOO_LARGE = 2
+    PARSE_ERROR = 3
+
+
+class IOPriority(Enum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
 PROTOCOL_VERSION = protocol_version
+SNAPSHOT_VERSION = 2
 
 
 ERROR_CONFIGURATION_NOT_FOUND = -100
+ERROR_DATA_NOT_FOUND = -200
 
 
 CONFIGURATION_NAME = 'automate.yaml'
+CONFIGURATION_HEADER_BYTE_COUNT = 64 * 1024
+CONFIGURATION_HEADER_PATTERN = re.compile(
+    rb'(?:^|[{,])[\s\'"]*crosscompute[\'"]?\s*:', re.MULTILINE)
+CONFIGURATION_NAME_CACHE_LENGTH = 256
 TOOL_NAME = 'Tool X'
 KIT_NAME = 'Kit X'
 TOOL_VERSION = '0.0.0'
@@ -33,8 +51,32 @@ VARIABLE_ID_TEMPLATE_PATTERN = re.compile(r'{ *([a-zA-Z0-9_| ]+?) *}')
 DOMAIN_PATTERN = re.compile(r'[^a-z0-9.-]')
 
 
+IO_THREAD_COUNT = 8
+IO_BACKGROUND_THREAD_COUNT = 4
+
+
+STORE_CACHE_LENGTH = 16
+BATCH_TIMEOUT_IN_SECONDS = 60
+DEFINITION_CHECK_INTERVAL_IN_SECONDS = 2
+
+
 RAW_DATA_BYTE_COUNT = 16 * 1024
 RAW_DATA_CACHE_LENGTH = 256
+PREVIEW_BYTE_COUNT = 4 * 1024
+PREVIEW_FEATURES_PATTERN = re.compile(r'"features"\s*:\s*\[')
+WHITESPACE_PATTERN = re.compile(r'\s*')
+PATH_TEMPLATE_PATTERN = re.compile(r'{(index|suffix)}')
+CHANGE_TOKEN_CACHE_LENGTH = 256
+FOLDER_NAMES_CACHE_LENGTH = 64
+MISSING_DATA_CACHE_LENGTH = 1024
+SHARED_DATA_CACHE_BYTE_COUNT = 64 * 1024 * 1024
+SHARED_DATA_CACHE_ACCESS_INTERVAL_IN_SECONDS = 60
+SHARED_DATA_CACHE_TIMEOUT_IN_SECONDS = 5
+
+
+COMPRESSION_SUFFIXES = '.gz', '.zst'
+FINGERPRINT_BYTE_COUNT = 16
+FINGERPRINT_CHUNK_BYTE_COUNT = 1024 * 1024
 
 
 SCRIPT_LANGUAGE = 'python'
@@ -59,3 +101,4 @@ DATA_VALUE = 'v'
 DATA_PATH = 'p'
 DATA_URI = 'u'
 DATA_CONFIGURATION = 'c'
+DATA_PREVIEW = 'w'
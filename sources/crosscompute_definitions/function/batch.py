@@ -0,0 +1,141 @@
+import asyncio
+import resource
+from collections import deque
+from hashlib import blake2b
+from multiprocessing import Pipe, Process
+from os import cpu_count
+from pathlib import PurePath
+from time import perf_counter
+
+from ..constant import (
+    BATCH_TIMEOUT_IN_SECONDS)
+from ..error import (
+    CrossComputeError)
+from ..setting import (
+    printer_by_name,
+    view_by_name)
+from .configuration import (
+    load_configuration)
+from .snapshot import (
+    load_configuration_with_snapshot)
+
+
+async def validate_configurations(
+        paths, *, process_count=None,
+        timeout_in_seconds=BATCH_TIMEOUT_IN_SECONDS, memory_byte_count=None,
+        snapshot_folder=None):
+    initargs = dict(view_by_name), dict(printer_by_name), memory_byte_count
+    queue = deque(enumerate(paths))
+    results = [None] * len(queue)
+
+    async def work():
+        worker = None
+        try:
+            while queue:
+                index, path = queue.popleft()
+                if worker is None:
+                    worker = BatchWorker(initargs)
+                try:
+                    result = await worker.run(
+                        str(path), get_snapshot_path(snapshot_folder, path),
+                        timeout_in_seconds=timeout_in_seconds)
+                except (TimeoutError, asyncio.TimeoutError, EOFError,
+                        OSError) as e:
+                    worker.terminate()
+                    worker = None
+                    result = get_error_result(path, e, timeout_in_seconds)
+                results[index] = result
+        finally:
+            if worker is not None:
+                worker.terminate()
+
+    worker_count = min(process_count or cpu_count() or 1, len(queue))
+    await asyncio.gather(*(work() for _ in range(worker_count)))
+    return results
+
+
+class BatchWorker:
+
+    def __init__(self, initargs):
+        self._connection, connection = Pipe()
+        self._process = Process(
+            target=run_worker, args=(connection, initargs), daemon=True)
+        self._process.start()
+        connection.close()
+
+    async def run(self, path, snapshot_path, *, timeout_in_seconds):
+        loop = asyncio.get_running_loop()
+        self._connection.send((path, snapshot_path))
+        return await asyncio.wait_for(loop.run_in_executor(
+            None, self._connection.recv), timeout_in_seconds)
+
+    def terminate(self):
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+
+
+def run_worker(connection, initargs):
+    initialize_process(*initargs)
+    while True:
+        try:
+            path, snapshot_path = connection.recv()
+        except EOFError:
+            break
+        connection.send(validate_configuration_in_process(
+            path, snapshot_path))
+
+
+def initialize_process(
+        process_view_by_name, process_printer_by_name, memory_byte_count):
+    view_by_name.update(process_view_by_name)
+    printer_by_name.update(process_printer_by_name)
+    if memory_byte_count:
+        resource.setrlimit(resource.RLIMIT_AS, (
+            memory_byte_count, memory_byte_count))
+
+
+def validate_configuration_in_process(path, snapshot_path):
+    start_time = perf_counter()
+    try:
+        asyncio.run(validate_configuration(path, snapshot_path))
+    except CrossComputeError as e:
+        error_map = e.get_map()
+    except MemoryError:
+        error_map = CrossComputeError(
+            'validation exceeded memory limit').get_map()
+    except Exception as e:  # noqa: BLE001
+        error_map = CrossComputeError(f'validation failed; {e}').get_map()
+    else:
+        error_map = {}
+    return {
+        'path': path,
+        'is_valid': not error_map,
+        'duration_in_seconds': perf_counter() - start_time,
+        'error': error_map}
+
+
+async def validate_configuration(path, snapshot_path):
+    if snapshot_path:
+        await load_configuration_with_snapshot(path, snapshot_path)
+    else:
+        await load_configuration(path)
+
+
+def get_error_result(path, e, timeout_in_seconds):
+    if isinstance(e, TimeoutError | asyncio.TimeoutError):
+        x = f'validation exceeded {timeout_in_seconds} seconds'
+    else:
+        x = 'validation process stopped unexpectedly'
+    return {
+        'path': str(path),
+        'is_valid': False,
+        'duration_in_seconds': None,
+        'error': CrossComputeError(x).get_map()}
+
+
+def get_snapshot_path(snapshot_folder, path):
+    if not snapshot_folder:
+        return None
+    name = blake2b(str(path).encode(), digest_size=16).hexdigest()
+    return PurePath(snapshot_folder) / f'{name}.pickle'
@@ -0,0 +1,207 @@
+import asyncio
+import pickle
+import sqlite3
+from functools import partial
+from logging import getLogger
+from os import getpid
+from threading import Lock
+from time import time
+
+from crosscompute_macros.iterable import (
+    LRUDict)
+
+from ..constant import (
+    SHARED_DATA_CACHE_ACCESS_INTERVAL_IN_SECONDS,
+    SHARED_DATA_CACHE_BYTE_COUNT,
+    SHARED_DATA_CACHE_TIMEOUT_IN_SECONDS)
+from .disk import (
+    add_source_path,
+    load_path_state,
+    run_disk_function)
+
+
+class DataCache(LRUDict):
+
+    def __init__(self, *args, load, length, shared_cache=None, **kwargs):
+        super().__init__(*args, length=length, **kwargs)
+        self._load = load
+        self._task_by_key = {}
+        self.shared_cache = shared_cache
+
+    async def get(self, path, *args):
+        path = str(path)
+        key = (path, *args) if args else path
+        add_source_path(path)
+        state = await load_path_state(path)
+        if key in self:
+            old_state, data = self[key]
+            if state is not None and state == old_state:
+                return data
+        d = self._task_by_key
+        task_key = key, state
+        task = d.get(task_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = d[task_key] = asyncio.ensure_future(self._refresh(
+                key, state, path, *args))
+            task.add_done_callback(partial(self._finish, task_key))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key, state, path, *args):
+        shared_cache = self.shared_cache
+        shared_key = repr(key) if args else path
+        if state is not None and shared_cache:
+            data = await shared_cache.get(shared_key, state)
+            if data is not None:
+                self[key] = state, data
+                return data
+        data = await self._load(path, *args)
+        if state is not None:
+            self[key] = state, data
+            if shared_cache:
+                await shared_cache.set(shared_key, state, data)
+        return data
+
+    def _finish(self, task_key, task):
+        self._task_by_key.pop(task_key, None)
+        if not task.cancelled():
+            task.exception()
+
+
+class SharedDataCache:
+
+    def __init__(
+            self, path, byte_count=SHARED_DATA_CACHE_BYTE_COUNT,
+            timeout_in_seconds=SHARED_DATA_CACHE_TIMEOUT_IN_SECONDS):
+        self.path = str(path)
+        self.byte_count = byte_count
+        self.timeout_in_seconds = timeout_in_seconds
+        self._connection = None
+        self._process_id = None
+        self._lock = Lock()
+
+    async def get(self, path, state):
+        return await run_disk_function(self.sync_get, path, state)
+
+    async def set(self, path, state, data):
+        await run_disk_function(self.sync_set, path, state, data)
+
+    def sync_get(self, path, state):
+        modification_time, byte_count = state
+        try:
+            with self._lock:
+                connection = self._get_connection()
+                row = connection.execute(
+                    'SELECT payload, access_time FROM data WHERE path = ? '
+                    'AND modification_time = ? AND byte_count = ?',
+                    (path, modification_time, byte_count)).fetchone()
+                if row is None:
+                    return None
+                access_time = time()
+                if access_time - row[1] > (
+                        SHARED_DATA_CACHE_ACCESS_INTERVAL_IN_SECONDS):
+                    with connection:
+                        connection.execute(
+                            'UPDATE data SET access_time = ? WHERE path = ?',
+                            (access_time, path))
+        except sqlite3.Error as e:
+            L.warning('could not read shared data cache; %s', e)
+            return None
+        try:
+            return pickle.loads(row[0])  # noqa: S301
+        except (pickle.UnpicklingError, EOFError, ValueError) as e:
+            L.warning('could not parse shared data cache entry; %s', e)
+            return None
+
+    def sync_set(self, path, state, data):
+        modification_time, byte_count = state
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        payload_byte_count = len(payload)
+        if payload_byte_count > self.byte_count:
+            return
+        try:
+            with self._lock:
+                connection = self._get_connection()
+                with connection:
+                    connection.execute(
+                        'UPDATE total SET byte_count = byte_count - COALESCE(('
+                        'SELECT payload_byte_count FROM data WHERE path = ?'
+                        '), 0)', (path,))
+                    connection.execute(
+                        'INSERT OR REPLACE INTO data VALUES '
+                        '(?, ?, ?, ?, ?, ?)', (
+                            path, modification_time, byte_count, payload,
+                            payload_byte_count, time()))
+                    connection.execute(
+                        'UPDATE total SET byte_count = byte_count + ?',
+                        (payload_byte_count,))
+                    self._evict(connection)
+        except sqlite3.Error as e:
+            L.warning('could not write shared data cache; %s', e)
+
+    def clear(self):
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute('DELETE FROM data')
+                connection.execute('UPDATE total SET byte_count = 0')
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                if self._process_id == getpid():
+                    self._connection.close()
+                self._connection = None
+
+    def _get_connection(self):
+        process_id = getpid()
+        if self._connection is None or self._process_id != process_id:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout_in_seconds,
+                check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS data ('
+                    'path TEXT PRIMARY KEY, '
+                    'modification_time INTEGER, '
+                    'byte_count INTEGER, '
+                    'payload BLOB, '
+                    'payload_byte_count INTEGER, '
+                    'access_time REAL)')
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS data_access_time '
+                    'ON data (access_time)')
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS total ('
+                    'id INTEGER PRIMARY KEY CHECK (id = 0), '
+                    'byte_count INTEGER)')
+                connection.execute(
+                    'INSERT OR IGNORE INTO total SELECT 0, '
+                    'COALESCE(SUM(payload_byte_count), 0) FROM data')
+            self._connection = connection
+            self._process_id = process_id
+        return self._connection
+
+    def _evict(self, connection):
+        total_byte_count, = connection.execute(
+            'SELECT byte_count FROM total').fetchone()
+        excess_byte_count = total_byte_count - self.byte_count
+        if excess_byte_count <= 0:
+            return
+        paths = []
+        evicted_byte_count = 0
+        for path, payload_byte_count in connection.execute(
+                'SELECT path, payload_byte_count FROM data '
+                'ORDER BY access_time'):
+            paths.append((path,))
+            evicted_byte_count += payload_byte_count
+            if evicted_byte_count >= excess_byte_count:
+                break
+        connection.executemany('DELETE FROM data WHERE path = ?', paths)
+        connection.execute(
+            'UPDATE total SET byte_count = byte_count - ?',
+            (evicted_byte_count,))
+
+
+L = getLogger(__name__)
@@ -1,38 +1,28 @@
 # TODO: Check string lengths
 import csv
 from collections import Counter
-from contextlib import suppress
+from contextlib import contextmanager
 from logging import getLogger
 from os.path import basename
 from pathlib import PurePath
 
-import aiofiles
-from crosscompute_macros.disk import (
-    get_absolute_path,
-    is_contained_path,
-    is_existing_path,
-    is_file_path,
-    is_folder_path,
-    is_link_path,
-    is_path_in_folder,
-    list_paths)
 from crosscompute_macros.error import (
     DiskError,
     ParsingError)
 from crosscompute_macros.iterable import (
+    LRUDict,
     apply_functions,
     find_item)
 from crosscompute_macros.log import (
     redact_path)
-from crosscompute_macros.package import (
-    is_equivalent_version)
 from crosscompute_macros.text import (
     format_name, format_slug)
-from crosscompute_macros.yaml import (
-    load_raw_yaml)
 
 from ..constant import (
+    CONFIGURATION_HEADER_BYTE_COUNT,
+    CONFIGURATION_HEADER_PATTERN,
     CONFIGURATION_NAME,
+    CONFIGURATION_NAME_CACHE_LENGTH,
     DATA_VALUE,
     DOMAIN_PATTERN,
     ENGINE_NAME,
@@ -57,9 +47,35 @@ from ..error import (
 from ..setting import (
     printer_by_name,
     view_by_name)
+from .disk import (
+    get_absolute_path,
+    get_compression_suffix,
+    get_data_suffix,
+    get_modification_time,
+    get_path_cache,
+    get_path_template_pattern,
+    is_contained_path,
+    is_existing_path,
+    is_file_path,
+    is_folder_path,
+    is_link_path,
+    is_real_path_in_folder,
+    list_paths,
+    load_raw_bytes,
+    load_raw_lines,
+    use_path_cache,
+    use_source_paths)
+from .fingerprint import (
+    get_execution_fingerprint,
+    get_fingerprint,
+    get_preset_fingerprint,
+    get_tool_fingerprint)
 from .variable import (
-    LoadableVariableView,
-    load_variable_data_by_id)
+    get_variable_view,
+    load_changed_variable_data_by_id,
+    load_variable_data_by_id,
+    load_variable_status_by_id,
+    load_variable_view)
 
 
 class Definition(dict):
@@ -93,19 +109,88 @@ class ToolDefinition(Definition):
         self.absolute_path = path = await get_absolute_path(kwargs['path'])
         self.absolute_folder = PurePath(path).parent
         self.locus = kwargs['locus']
-        self._validation_functions.extend([
-            validate_protocol,
-            validate_paths,
-            validate_tool_identifiers,
-            validate_copyrights,
-            validate_tools,
-            validate_steps,
-            validate_prints,
-            validate_presets,
-            validate_datasets,
-            validate_scripts,
-            validate_execution,
-            validate_display])
+        self.with_disk = kwargs.get('with_disk', True)
+        self.with_outline = kwargs.get('with_outline', False)
+        self.with_lazy = kwargs.get('with_lazy', False)
+        self.is_partial = not self.with_disk or self.with_outline
+        self.source_paths = [PurePath(path)]
+        self._lazy_validation_function_by_name = {}
+        if self.with_outline:
+            self._validation_functions.extend([
+                validate_protocol,
+                validate_paths,
+                validate_tool_identifiers,
+                validate_tools])
+        else:
+            self._validation_functions.extend([
+                validate_protocol,
+                validate_paths,
+                validate_tool_identifiers,
+                validate_copyrights,
+                validate_tools,
+                validate_steps,
+                validate_prints,
+                validate_presets,
+                validate_datasets,
+                validate_scripts])
+            validation_function_by_name = {
+                'execution_definition': validate_execution,
+                'display_definition': validate_display}
+            if self.with_lazy:
+                self._lazy_validation_function_by_name.update(
+                    validation_function_by_name)
+            else:
+                self._validation_functions.extend(
+                    validation_function_by_name.values())
+
+    def __getattr__(self, name):
+        d = self.__dict__.get('_lazy_validation_function_by_name', {})
+        if name in d:
+            x = (
+                f'{name} is not validated yet; await get_{name}() or '
+                'finish_validation() first')
+            raise AttributeError(x)
+        raise AttributeError(name)
+
+    async def get_execution_definition(self):
+        await self._finish_lazy_validation('execution_definition')
+        return self.execution_definition
+
+    async def get_display_definition(self):
+        await self._finish_lazy_validation('display_definition')
+        return self.display_definition
+
+    async def finish_validation(self):
+        for name in list(self._lazy_validation_function_by_name):
+            await self._finish_lazy_validation(name)
+        for tool_definition in getattr(self, 'tool_definitions', []):
+            if tool_definition is self:
+                continue
+            await tool_definition.finish_validation()
+            self.source_paths.extend(tool_definition.source_paths)
+
+    async def _validate(self):
+        with use_source_paths() as source_paths:
+            await super()._validate()
+        self.source_paths.extend(PurePath(_) for _ in sorted(source_paths))
+
+    async def _finish_lazy_validation(self, name):
+        d = self._lazy_validation_function_by_name
+        if name not in d:
+            return
+        with self._handle_lazy_error(), use_source_paths() as source_paths:
+            self.__dict__.update(await d[name](self))
+        self.source_paths.extend(PurePath(_) for _ in sorted(source_paths))
+        d.pop(name, None)
+
+    @contextmanager
+    def _handle_lazy_error(self):
+        try:
+            yield
+        except CrossComputeConfigurationError as e:
+            if not hasattr(e, 'path'):
+                e.path = self.absolute_path
+            raise
 
     async def load_data_by_id(self, result_folder, step_name):
         variable_definitions = self.get_variable_definitions(step_name)
@@ -115,12 +200,54 @@ class ToolDefinition(Definition):
             step_folder, variable_definitions)
         return data_by_id
 
+    async def load_status_by_id(self, result_folder, step_name):
+        variable_definitions = self.get_variable_definitions(step_name)
+        tool_folder = self.absolute_folder
+        step_folder = tool_folder / result_folder / step_name
+        return await load_variable_status_by_id(
+            step_folder, variable_definitions)
+
+    async def load_changed_data_by_id(
+            self, result_folder, step_name, change_token=None):
+        variable_definitions = self.get_variable_definitions(step_name)
+        tool_folder = self.absolute_folder
+        step_folder = tool_folder / result_folder / step_name
+        return await load_changed_variable_data_by_id(
+            step_folder, variable_definitions, change_token)
+
     def get_variable_definitions(self, step_name):
         d = self.step_definition_by_name
         if step_name not in d:
             return []
         return d[step_name].variable_definitions
 
+    def get_variable_definition(self, step_name, variable_id):
+        return self.variable_definition_by_step_id.get((
+            step_name, variable_id))
+
+    def find_variable_definitions(self, variable_id):
+        return self.variable_definitions_by_id.get(variable_id, [])
+
+    def match_variable_definition(self, step_name, path_name):
+        path_name = str(path_name)
+        suffix = get_compression_suffix(path_name)
+        if suffix:
+            path_name = path_name[:-len(suffix)]
+        d = self.variable_definition_by_step_path
+        if (step_name, path_name) in d:
+            return d[step_name, path_name]
+        for variable_step_name, pattern, variable_definition in (
+                self.variable_path_patterns):
+            if variable_step_name == step_name and pattern.match(path_name):
+                return variable_definition
+        return None
+
+    def get_data_paths(self, result_folder, step_name):
+        step_folder = self.absolute_folder / result_folder / step_name
+        return list(dict.fromkeys([step_folder] + [
+            step_folder / _.path_name
+            for _ in self.get_variable_definitions(step_name)]))
+
 
 class CopyrightDefinition(Definition):
 
@@ -177,7 +304,8 @@ class ExecutionDefinition(Definition):
             validate_packages,
             validate_ports,
             validate_execution_variables,
-            validate_apis])
+            validate_apis,
+            validate_execution_fingerprint])
 
 
 class DisplayDefinition(Definition):
@@ -196,7 +324,8 @@ class StepVariableDefinition(Definition):
         self.step_name = kwargs.get('step_name')
         self._validation_functions.extend([
             validate_step_variable_identifiers,
-            validate_step_variable_configuration])
+            validate_step_variable_configuration,
+            validate_step_variable_view])
 
 
 class ExecutionVariableDefinition(Definition):
@@ -266,29 +395,60 @@ class APIDefinition(Definition):
             validate_api_identifiers])
 
 
-async def load_configuration(path_or_folder, locus='0'):
+async def load_configuration(
+        path_or_folder, locus='0', *, with_disk=True, with_outline=False,
+        with_lazy=False, path_cache=None):
     path_or_folder = PurePath(path_or_folder)
-    if await is_file_path(path_or_folder):
-        configuration = await load_configuration_from_path(
-            path_or_folder, locus)
-    elif await is_folder_path(path_or_folder):
-        configuration = await load_configuration_from_folder(
-            path_or_folder, locus)
-    elif not await is_existing_path(path_or_folder):
-        x = f'path "{redact_path(path_or_folder)}" does not exist'
-        raise CrossComputeConfigurationError(x)
-    else:
-        x = f'path "{redact_path(path_or_folder)}" must be a file or folder'
-        raise CrossComputeFormatError(x)
+    kwargs = {
+        'with_disk': with_disk,
+        'with_outline': with_outline,
+        'with_lazy': with_lazy}
+    with use_path_cache(path_cache):
+        if await is_file_path(path_or_folder):
+            configuration = await load_configuration_from_path(
+                path_or_folder, locus, **kwargs)
+        elif await is_folder_path(path_or_folder):
+            configuration = await load_configuration_from_folder(
+                path_or_folder, locus, **kwargs)
+        elif not await is_existing_path(path_or_folder):
+            x = f'path "{redact_path(path_or_folder)}" does not exist'
+            raise CrossComputeConfigurationError(x)
+        else:
+            x = (
+                f'path "{redact_path(path_or_folder)}" must be a file or '
+                'folder')
+            raise CrossComputeFormatError(x)
     return configuration
 
 
-async def load_configuration_from_path(path, locus):
+async def load_tool_configuration(
+        path_or_folder, *, tool_slug=None, tool_locus=None, with_disk=True,
+        with_lazy=False, path_cache=None):
+    if tool_locus:
+        key, value = 'locus', tool_locus
+    else:
+        key, value = 'slug', tool_slug
+    with use_path_cache(path_cache):
+        kit_definition = await load_configuration(
+            path_or_folder, with_disk=with_disk, with_outline=True)
+        try:
+            tool_outline = find_item(
+                kit_definition.tool_definitions, key, value)
+        except StopIteration as e:
+            x = f'tool {key} "{value}" was not found'
+            raise CrossComputeConfigurationError(x) from e
+        tool_definition = await load_configuration_from_path(
+            tool_outline.absolute_path, tool_outline.locus,
+            with_disk=with_disk, with_lazy=with_lazy)
+    return tool_definition
+
+
+async def load_configuration_from_path(path, locus, **kwargs):
     path = await get_absolute_path(path)
     L.debug('loading "%s"', redact_path(path))
     try:
         c = await load_raw_configuration(path)
-        c = await ToolDefinition.load(c, path=path, locus=locus)
+        c = await ToolDefinition.load(c, path=path, locus=locus, **kwargs)
     except CrossComputeConfigurationError as e:
         if not hasattr(e, 'path'):
             e.path = path
@@ -296,7 +456,23 @@ async def load_configuration_from_path(path, locus):
     return c
 
 
-async def load_configuration_from_folder(folder, locus):
+async def load_configuration_from_folder(folder, locus, **kwargs):
+    folder = PurePath(await get_absolute_path(folder))
+    modification_time = await get_modification_time(folder)
+    cache_key = str(folder)
+    if cache_key in configuration_name_cache:
+        old_modification_time, name = configuration_name_cache[cache_key]
+        if old_modification_time == modification_time:
+            try:
+                configuration = await load_configuration_from_path(
+                    folder / name, locus, **kwargs)
+            except CrossComputeConfigurationError:
+                raise
+            except CrossComputeError:
+                del configuration_name_cache[cache_key]
+            else:
+                configuration.source_paths.append(folder / CONFIGURATION_NAME)
+                return configuration
     relative_paths = await list_paths(folder)
     default_name = CONFIGURATION_NAME
     if default_name in relative_paths:
@@ -304,10 +480,11 @@ async def load_configuration_from_folder(folder, locus):
         relative_paths.insert(0, default_name)
     for relative_path in relative_paths:
         path = folder / relative_path
-        if await is_folder_path(path):
+        if not await is_configuration_path(path):
             continue
         try:
-            configuration = await load_configuration_from_path(path, locus)
+            configuration = await load_configuration_from_path(
+                path, locus, **kwargs)
         except CrossComputeConfigurationError:
             raise
         except (CrossComputeError, CrossComputeFormatError):
@@ -316,9 +493,25 @@ async def load_configuration_from_folder(folder, locus):
     else:
         x = 'configuration was not found'
         raise CrossComputeError(x, code=ERROR_CONFIGURATION_NOT_FOUND)
+    configuration_name_cache[cache_key] = modification_time, relative_path
+    configuration.source_paths.append(folder / default_name)
     return configuration
 
 
+async def is_configuration_path(path):
+    if await is_folder_path(path):
+        return False
+    try:
+        get_configuration_format(path)
+    except CrossComputeFormatError:
+        return False
+    try:
+        header = await load_raw_bytes(path, CONFIGURATION_HEADER_BYTE_COUNT)
+    except DiskError:
+        return True
+    return CONFIGURATION_HEADER_PATTERN.search(header) is not None
+
+
 async def load_raw_configuration(configuration_path, *, with_comments=False):
     configuration_format = get_configuration_format(configuration_path)
     load = {
@@ -332,8 +525,20 @@ async def load_raw_configuration(configuration_path, *, with_comments=False):
     return configuration
 
 
+async def load_raw_yaml(path, with_comments=False):
+    from ruamel.yaml import YAML  # noqa: PLC0415
+    from ruamel.yaml.error import YAMLError  # noqa: PLC0415
+    yaml = YAML(typ='rt' if with_comments else 'safe')
+    try:
+        dictionary = yaml.load(await load_raw_bytes(path))
+    except YAMLError as e:
+        x = f'file is not yaml; {e}'
+        raise ParsingError(x, path=path) from e
+    return dictionary or {}
+
+
 def get_configuration_format(path):
-    suffix = PurePath(path).suffix
+    suffix = get_data_suffix(path)
     try:
         configuration_format = {
             '.yaml': 'yaml',
@@ -346,6 +551,8 @@ def get_configuration_format(path):
 
 
 async def validate_protocol(d):
+    from crosscompute_macros.package import (  # noqa: PLC0415
+        is_equivalent_version)
     if 'crosscompute' not in d:
         x = 'crosscompute protocol version is missing'
         raise CrossComputeError(x)
@@ -365,8 +572,10 @@ async def validate_protocol(d):
 
 
 async def validate_paths(d):
-    packs = list(d.items())
     folder = PurePath(d.absolute_folder)
+    packs = list(d.items())
+    container_ids = set()
+    path_packs = []
     while packs:
         k, v = packs.pop()
         if k in ['path', 'folder']:
@@ -375,20 +584,41 @@ async def validate_paths(d):
             except TypeError as e:
                 x = f'{k} "{redact_path(v)}" must be a string'
                 raise CrossComputeConfigurationError(x) from e
-            if not await is_path_in_folder(path, folder):
-                x = (
-                    f'{k} "{redact_path(v)}" must be in folder '
-                    f'"{redact_path(folder)}"')
-                raise CrossComputeConfigurationError(x)
-        elif isinstance(v, dict):
-            packs.extend(v.items())
-        elif isinstance(v, list):
-            for x in v:
-                with suppress(AttributeError):
-                    packs.extend(x.items())
+            path_packs.append((k, v, path))
+        elif k == 'configuration' and isinstance(v, dict):
+            if 'path' in v:
+                packs.append(('path', v['path']))
+        elif isinstance(v, dict | list):
+            if id(v) in container_ids:
+                continue
+            container_ids.add(id(v))
+            if isinstance(v, dict):
+                packs.extend(v.items())
+            else:
+                packs.extend(
+                    _ for x in v if isinstance(x, dict) for _ in x.items())
+    if not path_packs:
+        return {}
+    if not getattr(d, 'with_disk', True):
+        for k, v, _ in path_packs:
+            if not is_contained_path(v):
+                raise get_folder_error(k, v, folder)
+        return {}
+    real_folder, *real_paths = await get_path_cache().get_real_paths(
+        [folder] + [_[2] for _ in path_packs])
+    for (k, v, _), real_path in zip(path_packs, real_paths, strict=True):
+        if real_folder and real_path and is_real_path_in_folder(
+                real_path, real_folder):
+            continue
+        raise get_folder_error(k, v, folder)
     return {}
 
 
+def get_folder_error(k, v, folder):
+    x = f'{k} "{redact_path(v)}" must be in folder "{redact_path(folder)}"'
+    return CrossComputeConfigurationError(x)
+
+
 async def validate_tool_identifiers(d):
     name = d.get('name', (
         TOOL_NAME if 'output' in d else KIT_NAME
@@ -415,12 +645,16 @@ async def validate_tools(d):
         else:
             x = 'path is required for each tool'
             raise CrossComputeConfigurationError(x)
+        if not d.with_disk and not d.with_outline:
+            continue
         try:
             tool_configuration = await load_configuration(
-                path, f'{d.locus}-{i}')
+                path, f'{d.locus}-{i}', with_disk=d.with_disk,
+                with_outline=d.with_outline, with_lazy=d.with_lazy)
         except CrossComputeFormatError as e:
             raise CrossComputeConfigurationError(e) from e
         tool_definitions.extend(tool_configuration.tool_definitions)
+        d.source_paths.extend(tool_configuration.source_paths)
     assert_unique_values([_.name for _ in tool_definitions], 'tool name "{x}"')
     assert_unique_values([_.slug for _ in tool_definitions], 'tool slug "{x}"')
     return {'tool_definitions': tool_definitions}
@@ -428,6 +662,10 @@ async def validate_tools(d):
 
 async def validate_steps(d):
     step_definition_by_name = {}
+    variable_definition_by_step_id = {}
+    variable_definitions_by_id = {}
+    variable_definition_by_step_path = {}
+    variable_path_patterns = []
     tool_variable_ids = []
     for step_name in STEP_NAMES:
         if step_name not in d:
@@ -441,10 +679,29 @@ async def validate_steps(d):
         variable_ids = [_.id for _ in step_definition.variable_definitions]
         assert_unique_values(variable_ids, 'variable id "{x}"')
         tool_variable_ids.extend(variable_ids)
+        for variable_definition in step_definition.variable_definitions:
+            variable_id = variable_definition.id
+            path_name = variable_definition.path_name
+            variable_definition_by_step_id[
+                step_name, variable_id] = variable_definition
+            variable_definitions_by_id.setdefault(variable_id, []).append(
+                variable_definition)
+            if '{' in path_name:
+                variable_path_patterns.append((
+                    step_name, get_path_template_pattern(path_name),
+                    variable_definition))
+            else:
+                variable_definition_by_step_path[
+                    step_name, path_name] = variable_definition
     if 'return_code' in tool_variable_ids:
         x = '"return_code" is a reserved variable'
         raise CrossComputeConfigurationError(x)
-    return {'step_definition_by_name': step_definition_by_name}
+    return {
+        'step_definition_by_name': step_definition_by_name,
+        'variable_definition_by_step_id': variable_definition_by_step_id,
+        'variable_definitions_by_id': variable_definitions_by_id,
+        'variable_definition_by_step_path': variable_definition_by_step_path,
+        'variable_path_patterns': variable_path_patterns}
 
 
 async def validate_prints(d):
@@ -470,11 +727,13 @@ async def validate_prints(d):
 
 async def validate_presets(d):
     preset_definitions = []
-    for preset_map in get_maps(d, 'presets'):
+    preset_maps = get_maps(d, 'presets')
+    for preset_map in preset_maps:
         preset_definition = await PresetDefinition.load(
             preset_map, data={}, tool_definition=d)
         preset_definitions.extend(preset_definition.preset_definitions)
-    if 'output' in d and not preset_definitions:
+    if 'output' in d and not preset_definitions and (
+            d.with_disk or not preset_maps):
         x = 'no presets found; define at least one preset'
         raise CrossComputeConfigurationError(x)
     assert_unique_values([
@@ -483,6 +742,10 @@ async def validate_presets(d):
         _.name for _ in preset_definitions], 'preset name "{x}"')
     assert_unique_values([
         _.slug for _ in preset_definitions], 'preset slug "{x}"')
+    tool_fingerprint = await get_tool_fingerprint(d)
+    for preset_definition in preset_definitions:
+        preset_definition.fingerprint = await get_preset_fingerprint(
+            preset_definition, tool_fingerprint)
     return {'preset_definitions': preset_definitions}
 
 
@@ -499,6 +762,9 @@ async def validate_scripts(d):
     script_maps = get_maps(d, 'scripts')
     script_definitions = [await ScriptDefinition.load(
         _, tool_definition=d) for _ in script_maps]
+    if d.with_disk:
+        d.source_paths.extend(d.absolute_folder / _.folder / _[
+            'path'] for _ in script_definitions if 'path' in _)
     return {'script_definitions': script_definitions}
 
 
@@ -565,9 +831,13 @@ async def validate_preset_identifiers(d):
 
 async def validate_preset_reference(d):
     preset_reference = get_map(d, 'reference')
-    if 'folder' in preset_reference:
-        reference_data_by_id = await d.tool_definition.load_data_by_id(
-            preset_reference['folder'], 'input')
+    if 'folder' in preset_reference and d.tool_definition.with_disk:
+        tool_definition = d.tool_definition
+        reference_folder = preset_reference['folder']
+        reference_data_by_id = await tool_definition.load_data_by_id(
+            reference_folder, 'input')
+        tool_definition.source_paths.extend(tool_definition.get_data_paths(
+            reference_folder, 'input'))
     else:
         reference_data_by_id = {}
     return {'__reference_data_by_id': reference_data_by_id}
@@ -582,12 +852,15 @@ async def validate_preset_configuration(d):
     tool_folder = tool_definition.absolute_folder
     if 'path' in preset_configuration:
         path = tool_folder / preset_configuration.pop('path')
-        suffix = path.suffix
+        suffix = get_data_suffix(path)
         try:
             yield_data_by_id = YIELD_DATA_BY_ID_BY_SUFFIX[suffix]
         except KeyError as e:
             x = f'preset configuration suffix "{suffix}" is not supported'
             raise CrossComputeConfigurationError(x) from e
+        if not tool_definition.with_disk:
+            return {'preset_definitions': preset_definitions}
+        tool_definition.source_paths.append(path)
         input_variable_definitions = tool_definition.get_variable_definitions(
             'input')
         async for _ in yield_data_by_id(path, input_variable_definitions):
@@ -597,8 +870,13 @@ async def validate_preset_configuration(d):
                 d, tool_definition=tool_definition, data=data)
             preset_definitions.extend(preset_definition.preset_definitions)
     else:
-        data_by_id = await tool_definition.load_data_by_id(
-            d.folder_name, 'input')
+        if tool_definition.with_disk:
+            data_by_id = await tool_definition.load_data_by_id(
+                d.folder_name, 'input')
+            tool_definition.source_paths.extend(
+                tool_definition.get_data_paths(d.folder_name, 'input'))
+        else:
+            data_by_id = {}
         d.data[STEP_INPUT] = d.data.get(STEP_INPUT, {
         }) | reference_data_by_id | preset_configuration | data_by_id
         preset_definitions.append(d)
@@ -628,7 +906,7 @@ async def validate_dataset_reference(d):
     dataset_reference = get_map(d, 'reference')
     if 'path' in dataset_reference:
         reference_path = get_path(dataset_reference)
-        if reference_path:
+        if reference_path and d.tool_definition.with_disk:
             tool_folder = d.tool_definition.absolute_folder
             source_path = tool_folder / reference_path
             if not await is_existing_path(source_path):
@@ -670,8 +948,12 @@ async def validate_script_identifiers(d):
         method_string = ' and '.join(method_names)
         x = f'script {method_string} conflict; choose one'
         raise CrossComputeConfigurationError(x)
+    script_folder = PurePath(d.get('folder', '.'))
+    if 'function_string' in preparation_map:
+        preparation_map['source_fingerprint'] = get_fingerprint(
+            preparation_map['function_string'])
     return {
-        'folder': PurePath(d.get('folder', '.')),
+        'folder': script_folder,
         'command_string': command_string,
         'preparation_map': preparation_map}
 
@@ -689,6 +971,11 @@ async def validate_setup(d):
         script_map = get_map(setup_map, user_name)
         setup_definition_by_user_name[user_name] = await SetupDefinition.load(
             script_map, user_name=user_name, tool_definition=d.tool_definition)
+    tool_definition = d.tool_definition
+    if tool_definition.with_disk:
+        tool_definition.source_paths.extend(
+            tool_definition.absolute_folder / _.path_name
+            for _ in setup_definition_by_user_name.values())
     return {
         'setup_definition_by_user_name': setup_definition_by_user_name}
 
@@ -701,19 +988,22 @@ async def validate_packages(d):
         'package_definitions': package_definitions}
 
 
+async def validate_execution_fingerprint(d):
+    return {'fingerprint': await get_execution_fingerprint(d)}
+
+
 async def validate_ports(d):
     port_definitions = []
-    f = d.tool_definition.get_variable_definitions
-    variable_definitions = f('log') + f('debug')
+    f = d.tool_definition.get_variable_definition
     for port_map in get_maps(d, 'ports'):
         port_definition = await PortDefinition.load(port_map)
         port_id = port_definition.id
-        try:
-            variable_definition = find_item(
-                variable_definitions, 'id', port_id)
-        except StopIteration as e:
+        variable_definition = f('log', port_id)
+        if variable_definition is None:
+            variable_definition = f('debug', port_id)
+        if variable_definition is None:
             x = f'port "{port_id}" must correspond to a log or debug variable'
-            raise CrossComputeConfigurationError(x) from e
+            raise CrossComputeConfigurationError(x)
         port_definition.step_name = variable_definition.step_name
         port_definitions.append(port_definition)
     return {
@@ -790,9 +1080,20 @@ async def validate_step_variable_configuration(d):
         if not p.endswith('.json'):
             x = f'variable configuration path "{p}" suffix must be ".json"'
             raise CrossComputeConfigurationError(x)
+    for k in DATA_LIMIT_KEYS:
+        if k not in c:
+            continue
+        v = c[k] = get_required_integer(c, k, 'variable configuration')
+        if v <= 0:
+            x = f'variable configuration {k} must be greater than zero'
+            raise CrossComputeConfigurationError(x)
     return {'configuration': c}
 
 
+async def validate_step_variable_view(d):
+    return {'view': load_variable_view(d)}
+
+
 async def validate_execution_variable_identifiers(d):
     variable_id = get_required_string(d, 'id', 'variable')
     stage_name = get_optional_string(d, 'stage', 'variable', 'run')
@@ -820,7 +1121,8 @@ async def validate_setup_identifiers(d):
     user_name = d.user_name
     key = f'setup.{user_name}'
     path_name = get_required_string(d, 'path', key)
-    if not await is_existing_path(tool_folder / path_name):
+    if d.tool_definition.with_disk and not await is_existing_path(
+            tool_folder / path_name):
         x = f'{key} path "{path_name}" is invalid'
         raise CrossComputeConfigurationError(x)
     return {
@@ -921,22 +1223,21 @@ async def validate_api_identifiers(d):
 
 async def yield_data_by_id_from_csv(path, variable_definitions):
     try:
-        async with aiofiles.open(path, mode='rt') as f:
-            lines = await f.readlines()
-            csv_reader = csv.reader(lines)
-            keys = [_.strip() for _ in next(csv_reader)]
-            for values in csv_reader:
-                data_by_id = await parse_data_by_id({
-                    k: {DATA_VALUE: v}
-                    for k, v in zip(keys, values, strict=True)
-                }, variable_definitions)
-                if data_by_id.get('#') == '#':
-                    continue
-                yield data_by_id
+        lines = await load_raw_lines(path)
+        csv_reader = csv.reader(lines)
+        keys = [_.strip() for _ in next(csv_reader)]
+        for values in csv_reader:
+            data_by_id = await parse_data_by_id({
+                k: {DATA_VALUE: v}
+                for k, v in zip(keys, values, strict=True)
+            }, variable_definitions)
+            if data_by_id.get('#') == '#':
+                continue
+            yield data_by_id
     except ValueError as e:
         x = f'row={values} does not have {len(keys)} columns'
         raise CrossComputeConfigurationError(x, path=path) from e
-    except OSError as e:
+    except (DiskError, ParsingError) as e:
         raise CrossComputeConfigurationError(e) from e
     except StopIteration:
         pass
@@ -956,18 +1257,17 @@ async def yield_data_by_id_from_txt(path, variable_definitions):
             'configuration suffix ".txt"')
         raise CrossComputeConfigurationError(x) from e
     try:
-        async with aiofiles.open(path, mode='rt') as f:
-            lines = await f.readlines()
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                data_by_id = {variable_id: {DATA_VALUE: line}}
-                data_by_id = await parse_data_by_id(
-                    data_by_id, variable_definitions)
-                yield data_by_id
-    except OSError as e:
+        lines = await load_raw_lines(path)
+    except (DiskError, ParsingError) as e:
         raise CrossComputeConfigurationError(e) from e
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        data_by_id = {variable_id: {DATA_VALUE: line}}
+        data_by_id = await parse_data_by_id(
+            data_by_id, variable_definitions)
+        yield data_by_id
 
 
 async def parse_data_by_id(data_by_id, variable_definitions):
@@ -980,7 +1280,7 @@ async def parse_data_by_id(data_by_id, variable_definitions):
         if DATA_VALUE not in variable_data:
             continue
         variable_value = variable_data[DATA_VALUE]
-        variable_view = LoadableVariableView.get_from(variable_definition)
+        variable_view = get_variable_view(variable_definition)
         try:
             variable_value = await variable_view.parse(variable_value)
         except CrossComputeDataError as e:
@@ -1181,7 +1481,13 @@ def assert_unique_values(values, description):
 YIELD_DATA_BY_ID_BY_SUFFIX = {
     '.csv': yield_data_by_id_from_csv,
     '.txt': yield_data_by_id_from_txt}
+configuration_name_cache = LRUDict(length=CONFIGURATION_NAME_CACHE_LENGTH)
 STAGE_NAMES = ['setup', 'run']
 SCRIPT_SUFFIXES = ['.py', '.ipynb', '.sh']
 SCRIPT_LANGUAGES = ['python']
+DATA_LIMIT_KEYS = [
+    'inline-byte-count',
+    'preview-byte-count',
+    'preview-line-count',
+    'preview-feature-count']
 L = getLogger(__name__)
@@ -0,0 +1,246 @@
+import asyncio
+import pickle
+from logging import getLogger
+from pathlib import Path
+from tempfile import mkdtemp
+
+from crosscompute_macros.iterable import (
+    find_item)
+
+from ..constant import (
+    DEFINITION_CHECK_INTERVAL_IN_SECONDS,
+    IOPriority)
+from ..error import (
+    CrossComputeConfigurationError,
+    CrossComputeError)
+from .configuration import (
+    load_configuration)
+from .disk import (
+    get_absolute_path,
+    run_disk_function)
+from .scheduler import (
+    use_io_priority)
+from .snapshot import (
+    get_snapshot_header,
+    is_current_snapshot_header)
+
+
+class DefinitionServer:
+
+    def __init__(self):
+        self._entry_by_key = {}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:  # noqa: BLE001
+                    response = get_error_response(e)
+                else:
+                    response = await self.respond(request)
+                try:
+                    await write_frame(writer, response)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    await write_frame(writer, get_error_response(e))
+        finally:
+            writer.close()
+
+    async def respond(self, request):
+        try:
+            function_name = request.get('function_name')
+            if function_name not in FUNCTION_NAMES:
+                x = f'function "{function_name}" is not supported'
+                return {'error': CrossComputeError(x)}
+            f = getattr(self, function_name)
+            value = await f(
+                *request.get('args', ()), **request.get('kwargs', {}))
+        except CrossComputeError as e:
+            return {'error': e}
+        except Exception as e:  # noqa: BLE001
+            return get_error_response(e)
+        return {'value': value}
+
+    async def watch(self, interval_in_seconds):
+        while True:
+            await asyncio.sleep(interval_in_seconds)
+            await self.revalidate()
+
+    async def revalidate(self):
+        d = self._entry_by_key
+        with use_io_priority(IOPriority.BACKGROUND):
+            for key, (header, _) in list(d.items()):
+                if await run_disk_function(is_current_snapshot_header, header):
+                    continue
+                try:
+                    await self._load(*key)
+                except CrossComputeError as e:
+                    L.warning('could not revalidate "%s"; %s', key[0], e)
+                    d.pop(key, None)
+
+    async def load_configuration(self, path_or_folder, locus='0', **kwargs):
+        path_or_folder = await get_absolute_path(path_or_folder)
+        key = path_or_folder, locus, tuple(sorted(kwargs.items()))
+        d = self._entry_by_key
+        if key in d:
+            return d[key][1]
+        return await self._load(*key)
+
+    async def _load(self, path_or_folder, locus, option_items):
+        tool_definition = await load_configuration(
+            path_or_folder, locus, **dict(option_items))
+        header = await run_disk_function(
+            get_snapshot_header, tool_definition.source_paths)
+        key = path_or_folder, locus, option_items
+        self._entry_by_key[key] = header, tool_definition
+        return tool_definition
+
+    async def load_data_by_id(
+            self, path_or_folder, result_folder, step_name, *, tool_slug=None,
+            tool_locus=None):
+        tool_definition = await self.get_tool_definition(
+            path_or_folder, tool_slug, tool_locus)
+        return await tool_definition.load_data_by_id(result_folder, step_name)
+
+    async def load_changed_data_by_id(
+            self, path_or_folder, result_folder, step_name, change_token=None,
+            *, tool_slug=None, tool_locus=None):
+        tool_definition = await self.get_tool_definition(
+            path_or_folder, tool_slug, tool_locus)
+        return await tool_definition.load_changed_data_by_id(
+            result_folder, step_name, change_token)
+
+    async def get_preset_maps(
+            self, path_or_folder, *, tool_slug=None, tool_locus=None):
+        tool_definition = await self.get_tool_definition(
+            path_or_folder, tool_slug, tool_locus)
+        return [{
+            'name': _.name,
+            'slug': _.slug,
+            'folder': _.folder_name,
+            'data': _.data,
+        } for _ in tool_definition.preset_definitions]
+
+    async def get_tool_definition(self, path_or_folder, tool_slug, tool_locus):
+        kit_definition = await self.load_configuration(path_or_folder)
+        if tool_locus:
+            key, value = 'locus', tool_locus
+        elif tool_slug:
+            key, value = 'slug', tool_slug
+        else:
+            return kit_definition
+        try:
+            tool_definition = find_item(
+                kit_definition.tool_definitions, key, value)
+        except StopIteration as e:
+            x = f'tool {key} "{value}" was not found'
+            raise CrossComputeConfigurationError(x) from e
+        return tool_definition
+
+
+class DefinitionClient:
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+
+    async def load_configuration(self, path_or_folder, locus='0', **kwargs):
+        return await self._call(
+            'load_configuration', str(path_or_folder), locus, **kwargs)
+
+    async def load_data_by_id(
+            self, path_or_folder, result_folder, step_name, *, tool_slug=None,
+            tool_locus=None):
+        return await self._call(
+            'load_data_by_id', str(path_or_folder), str(result_folder),
+            step_name, tool_slug=tool_slug, tool_locus=tool_locus)
+
+    async def load_changed_data_by_id(
+            self, path_or_folder, result_folder, step_name, change_token=None,
+            *, tool_slug=None, tool_locus=None):
+        return await self._call(
+            'load_changed_data_by_id', str(path_or_folder),
+            str(result_folder), step_name, change_token, tool_slug=tool_slug,
+            tool_locus=tool_locus)
+
+    async def get_preset_maps(
+            self, path_or_folder, *, tool_slug=None, tool_locus=None):
+        return await self._call(
+            'get_preset_maps', str(path_or_folder), tool_slug=tool_slug,
+            tool_locus=tool_locus)
+
+    async def _call(self, function_name, *args, **kwargs):
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                self.socket_path)
+        except OSError as e:
+            x = f'definition server is not available; {e}'
+            raise CrossComputeError(x, path=self.socket_path) from e
+        try:
+            await write_frame(writer, {
+                'function_name': function_name,
+                'args': args,
+                'kwargs': kwargs})
+            response = await read_frame(reader)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            x = f'definition server stopped responding; {e}'
+            raise CrossComputeError(x, path=self.socket_path) from e
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        if 'error' in response:
+            raise response['error']
+        return response['value']
+
+
+async def serve_definitions(
+        socket_path,
+        check_interval_in_seconds=DEFINITION_CHECK_INTERVAL_IN_SECONDS):
+    definition_server = DefinitionServer()
+    socket_path = Path(socket_path)
+    private_folder = Path(mkdtemp(dir=socket_path.parent))
+    try:
+        private_path = private_folder / socket_path.name
+        server = await asyncio.start_unix_server(
+            definition_server.handle, path=private_path)
+        private_path.chmod(0o600)  # noqa: ASYNC240
+        private_path.replace(socket_path)  # noqa: ASYNC240
+    finally:
+        private_folder.rmdir()  # noqa: ASYNC240
+    L.info('serving definitions on "%s"', socket_path)
+    watch_task = asyncio.create_task(definition_server.watch(
+        check_interval_in_seconds))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watch_task.cancel()
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(FRAME_HEADER_BYTE_COUNT)
+    payload = await reader.readexactly(int.from_bytes(header, 'big'))
+    return pickle.loads(payload)  # noqa: S301
+
+
+async def write_frame(writer, value):
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(len(payload).to_bytes(FRAME_HEADER_BYTE_COUNT, 'big'))
+    writer.write(payload)
+    await writer.drain()
+
+
+def get_error_response(e):
+    L.exception('could not respond to request')
+    x = f'request could not be handled; {e!r}'
+    return {'error': CrossComputeError(x)}
+
+
+FUNCTION_NAMES = [
+    'load_configuration',
+    'load_data_by_id',
+    'load_changed_data_by_id',
+    'get_preset_maps']
+FRAME_HEADER_BYTE_COUNT = 8
+L = getLogger(__name__)
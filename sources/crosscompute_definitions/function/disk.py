@@ -1,14 +1,415 @@
+import gzip
+import json
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+from os import listdir, lstat, pardir, readlink, scandir, sep, stat
+from os.path import abspath, dirname, isabs, join, normpath
 from pathlib import PurePath
+from stat import S_ISDIR, S_ISLNK, S_ISREG
+from time import monotonic
 
-from crosscompute_macros.disk import (
-    list_paths)
+from crosscompute_macros.error import (
+    DiskError,
+    ParsingError)
+
+from ..constant import (
+    COMPRESSION_SUFFIXES,
+    PATH_TEMPLATE_PATTERN,
+    PREVIEW_FEATURES_PATTERN,
+    WHITESPACE_PATTERN)
+from .scheduler import (
+    io_scheduler)
+
+
+class PathCache:
+
+    def __init__(self, duration_in_seconds=None):
+        self._duration_in_seconds = duration_in_seconds
+        self._stat_by_path = {}
+        self._link_stat_by_path = {}
+        self._real_path_by_path = {}
+        self._expiration_time = None
+        self.clear()
+
+    def clear(self):
+        self._stat_by_path.clear()
+        self._link_stat_by_path.clear()
+        self._real_path_by_path.clear()
+        if self._duration_in_seconds is not None:
+            self._expiration_time = monotonic() + self._duration_in_seconds
+
+    def forget(self, path):
+        path = abspath(path)  # noqa: PTH100
+        self._stat_by_path.pop(path, None)
+        self._link_stat_by_path.pop(path, None)
+        self._real_path_by_path.clear()
+
+    def refresh(self):
+        t = self._expiration_time
+        if t is not None and monotonic() > t:
+            self.clear()
+
+    async def get_stat(self, path):
+        path = abspath(path)  # noqa: ASYNC240, PTH100
+        d = self._stat_by_path
+        if path in d:
+            return d[path]
+        return await run_disk_function(self.sync_get_stat, path)
+
+    async def get_link_stat(self, path):
+        path = abspath(path)  # noqa: ASYNC240, PTH100
+        d = self._link_stat_by_path
+        if path in d:
+            return d[path]
+        return await run_disk_function(self.sync_get_link_stat, path)
+
+    async def get_real_path(self, path):
+        real_path = (await self.get_real_paths([path]))[0]
+        if real_path is None:
+            x = 'file is a circular symlink'
+            raise DiskError(x, path=path)
+        return real_path
+
+    async def get_real_paths(self, paths):
+        paths = [abspath(_) for _ in paths]  # noqa: ASYNC240, PTH100
+        d = self._real_path_by_path
+        new_paths = [_ for _ in paths if _ not in d]
+        if new_paths:
+            await run_disk_function(self.sync_get_real_paths, new_paths)
+        return [d[_] for _ in paths]
+
+    def sync_get_stat(self, path):
+        d = self._stat_by_path
+        if path not in d:
+            try:
+                d[path] = stat(path)  # noqa: PTH116
+            except (OSError, ValueError):
+                d[path] = None
+        return d[path]
+
+    def sync_get_link_stat(self, path):
+        d = self._link_stat_by_path
+        if path not in d:
+            try:
+                d[path] = lstat(path)
+            except (OSError, ValueError):
+                d[path] = None
+        return d[path]
+
+    def sync_get_real_paths(self, paths):
+        return [self.sync_get_real_path(_) for _ in paths]
+
+    def sync_get_real_path(self, path):
+        d = self._real_path_by_path
+        paths = [path]
+        while path not in d and is_link_stat(self.sync_get_link_stat(path)):
+            try:
+                path = abspath(join(  # noqa: PTH100, PTH118
+                    dirname(path), readlink(path)))  # noqa: PTH115, PTH120
+            except OSError:
+                break
+            if path in paths:
+                path = None
+                break
+            paths.append(path)
+        real_path = d.get(path, path)
+        for _ in paths:
+            d[_] = real_path
+        return real_path
 
 
 async def get_matching_paths(path_template):
     path = PurePath(path_template)
     expression = path.name.format(suffix='.*', index='[0-9]+')
     folder = path.parent
+    add_source_path(folder)
     paths = await list_paths(folder)
     pattern = re.compile(expression + '$')
     return [folder / _ for _ in paths if pattern.match(_)]
+
+
+async def list_paths(folder):
+    return await run_disk_function(listdir, folder)
+
+
+async def get_absolute_path(path):
+    return abspath(path)  # noqa: ASYNC240, PTH100
+
+
+async def get_real_path(path):
+    return await get_path_cache().get_real_path(path)
+
+
+async def load_path_state(path):
+    return await run_disk_function(get_path_state, path)
+
+
+async def load_folder_snapshot(folder):
+    return await run_disk_function(get_folder_snapshot, folder)
+
+
+async def get_modification_time(path):
+    s = await get_path_cache().get_stat(path)
+    return None if s is None else s.st_mtime_ns
+
+
+async def is_existing_path(path):
+    return await get_path_cache().get_stat(path) is not None
+
+
+async def is_file_path(path):
+    return is_file_stat(await get_path_cache().get_stat(path))
+
+
+async def is_folder_path(path):
+    return is_folder_stat(await get_path_cache().get_stat(path))
+
+
+async def is_link_path(path):
+    return is_link_stat(await get_path_cache().get_link_stat(path))
+
+
+async def is_path_in_folder(path, folder):
+    path_cache = get_path_cache()
+    try:
+        path = await path_cache.get_real_path(path)
+        folder = await path_cache.get_real_path(folder)
+    except DiskError as e:
+        L.debug(e)
+        return False
+    return is_real_path_in_folder(path, folder)
+
+
+async def get_compressed_path(path):
+    for suffix in COMPRESSION_SUFFIXES:
+        compressed_path = PurePath(str(path) + suffix)
+        add_source_path(compressed_path)
+        if await is_file_path(compressed_path):
+            return compressed_path
+    return None
+
+
+async def load_raw_bytes(path, byte_count=-1):
+    add_source_path(path)
+    try:
+        raw_bytes = await run_disk_function(read_raw_bytes, path, byte_count)
+    except (OSError, EOFError) as e:
+        x = f'path is not accessible; {e}'
+        raise DiskError(x, path=path) from e
+    return raw_bytes
+
+
+async def load_raw_lines(path):
+    add_source_path(path)
+    try:
+        lines = await run_disk_function(read_raw_lines, path)
+    except (OSError, EOFError) as e:
+        x = f'path is not accessible; {e}'
+        raise DiskError(x, path=path) from e
+    except UnicodeDecodeError as e:
+        x = f'file is not valid text; {e}'
+        raise ParsingError(x, path=path) from e
+    return lines
+
+
+def read_raw_bytes(path, byte_count):
+    with open_path(path, 'rb') as f:
+        return f.read(byte_count)
+
+
+def read_raw_lines(path):
+    with open_path(path, 'rt') as f:
+        return f.readlines()
+
+
+def open_path(path, mode):
+    match get_compression_suffix(path):
+        case '.gz':
+            f = gzip.open(path, mode)  # noqa: SIM115
+        case '.zst':
+            try:
+                import zstandard  # noqa: PLC0415
+            except ImportError as e:
+                x = 'zstandard is missing; pip install zstandard'
+                raise OSError(x) from e
+            f = zstandard.open(path, mode)
+        case _:
+            f = open(path, mode)  # noqa: PTH123, SIM115
+    return f
+
+
+def parse_raw_text(raw_bytes, path):
+    try:
+        text = raw_bytes.decode()
+    except UnicodeDecodeError as e:
+        x = f'file is not valid text; {e}'
+        raise ParsingError(x, path=path) from e
+    return text.rstrip()
+
+
+def parse_raw_json(raw_bytes, path):
+    try:
+        value = json.loads(raw_bytes)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        x = f'file is not valid json; {e}'
+        raise ParsingError(x, path=path) from e
+    return value
+
+
+def parse_text_preview(raw_bytes, path, line_count=None):
+    text = decode_partial_bytes(raw_bytes, path)
+    if line_count:
+        text = ''.join(text.splitlines(keepends=True)[:line_count])
+    return text.rstrip()
+
+
+def parse_feature_preview(raw_bytes, path, feature_count=None):
+    text = decode_partial_bytes(raw_bytes, path)
+    features = []
+    match = PREVIEW_FEATURES_PATTERN.search(text)
+    if match:
+        decoder = json.JSONDecoder()
+        index = match.end()
+        while feature_count is None or len(features) < feature_count:
+            index = WHITESPACE_PATTERN.match(text, index).end()
+            try:
+                feature, index = decoder.raw_decode(text, index)
+            except json.JSONDecodeError:
+                break
+            features.append(feature)
+            index = WHITESPACE_PATTERN.match(text, index).end()
+            if text[index:index + 1] != ',':
+                break
+            index += 1
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def decode_partial_bytes(raw_bytes, path):
+    try:
+        text = raw_bytes.decode()
+    except UnicodeDecodeError as e:
+        if e.start < len(raw_bytes) - 3:
+            x = f'file is not valid text; {e}'
+            raise ParsingError(x, path=path) from e
+        text = raw_bytes[:e.start].decode()
+    return text
+
+
+async def run_disk_function(f, *args):
+    return await io_scheduler.run(f, *args)
+
+
+def get_path_state(path):
+    try:
+        s = stat(path)  # noqa: PTH116
+    except (OSError, ValueError):
+        return None
+    return s.st_mtime_ns, s.st_size
+
+
+def get_folder_snapshot(folder):
+    states = []
+    try:
+        with scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    s = entry.stat()
+                except OSError:
+                    continue
+                states.append((entry.name, s.st_mtime_ns, s.st_size))
+    except (OSError, ValueError):
+        return None
+    return tuple(sorted(states))
+
+
+def get_path_cache():
+    path_cache = path_cache_variable.get()
+    if path_cache is None:
+        return PathCache()
+    path_cache.refresh()
+    return path_cache
+
+
+@contextmanager
+def use_path_cache(path_cache=None):
+    if path_cache is None:
+        if path_cache_variable.get() is not None:
+            yield
+            return
+        path_cache = PathCache()
+    token = path_cache_variable.set(path_cache)
+    try:
+        yield
+    finally:
+        path_cache_variable.reset(token)
+
+
+@contextmanager
+def use_source_paths():
+    source_paths = set()
+    token = source_paths_variable.set(source_paths)
+    try:
+        yield source_paths
+    finally:
+        source_paths_variable.reset(token)
+
+
+def add_source_path(path):
+    source_paths = source_paths_variable.get()
+    if source_paths is not None:
+        source_paths.add(abspath(path))  # noqa: PTH100
+
+
+def get_path_template_pattern(name_template):
+    parts = []
+    for index, part in enumerate(PATH_TEMPLATE_PATTERN.split(name_template)):
+        if index % 2 == 0:
+            parts.append(re.escape(part))
+        elif part == 'index':
+            parts.append('(?P<index>[0-9]+)')
+        else:
+            parts.append(r'\..*')
+    return re.compile(''.join(parts) + '$')
+
+
+def is_contained_path(path):
+    path = normpath(path)
+    if isabs(path):  # noqa: PTH117
+        return False
+    return path != pardir and not path.startswith(pardir + sep)
+
+
+def is_real_path_in_folder(real_path, real_folder):
+    real_folder = real_folder.rstrip(sep) + sep
+    return real_path.startswith(real_folder) or real_path + sep == real_folder
+
+
+def is_file_stat(s):
+    return s is not None and S_ISREG(s.st_mode)
+
+
+def is_folder_stat(s):
+    return s is not None and S_ISDIR(s.st_mode)
+
+
+def is_link_stat(s):
+    return s is not None and S_ISLNK(s.st_mode)
+
+
+def get_compression_suffix(path):
+    suffix = PurePath(path).suffix
+    return suffix if suffix in COMPRESSION_SUFFIXES else ''
+
+
+def get_data_suffix(path):
+    path = PurePath(path)
+    if get_compression_suffix(path):
+        path = path.with_suffix('')
+    return path.suffix
+
+
+path_cache_variable = ContextVar('path_cache', default=None)
+source_paths_variable = ContextVar('source_paths', default=None)
+L = getLogger(__name__)
@@ -0,0 +1,157 @@
+import json
+from hashlib import blake2b
+from pathlib import Path, PurePath
+
+from ..constant import (
+    DATA_PATH,
+    FINGERPRINT_BYTE_COUNT,
+    FINGERPRINT_CHUNK_BYTE_COUNT,
+    STEP_INPUT)
+from .disk import (
+    run_disk_function)
+
+
+async def get_tool_fingerprint(tool_definition):
+    tool_folder = tool_definition.absolute_folder
+    script_maps = [_ for _ in tool_definition.get(
+        'scripts') or [] if isinstance(_, dict)]
+    script_fingerprints = []
+    if tool_definition.with_disk:
+        for script_map in script_maps:
+            if 'path' not in script_map:
+                continue
+            script_path = PurePath(
+                tool_folder, script_map.get('folder', '.'), script_map['path'])
+            script_fingerprints.append(await get_file_fingerprint(
+                script_path))
+    return get_fingerprint({
+        'scripts': script_maps,
+        'script_fingerprints': script_fingerprints,
+        'execution': tool_definition.get('execution') or {}})
+
+
+async def get_execution_fingerprint(execution_definition):
+    tool_definition = execution_definition.tool_definition
+    tool_folder = tool_definition.absolute_folder
+    setup_states = []
+    for user_name, setup_definition in sorted(
+            execution_definition.setup_definition_by_user_name.items()):
+        setup_path = tool_folder / setup_definition.path_name
+        setup_fingerprint = await get_file_fingerprint(
+            setup_path) if tool_definition.with_disk else None
+        setup_states.append((
+            user_name, setup_definition.path_name, setup_fingerprint))
+    package_states = sorted((
+        _.manager_name, _.id, _.mode_name,
+    ) for _ in execution_definition.package_definitions)
+    return get_fingerprint({
+        'engine': execution_definition.engine_name,
+        'image': execution_definition.parent_image_name,
+        'setup': setup_states,
+        'packages': package_states})
+
+
+async def get_preset_fingerprint(preset_definition, tool_fingerprint):
+    data_by_id = {}
+    with_disk = preset_definition.tool_definition.with_disk
+    for variable_id, variable_data in preset_definition.data.get(
+            STEP_INPUT, {}).items():
+        if isinstance(variable_data, dict) and DATA_PATH in variable_data:
+            variable_data = variable_data.copy()
+            path = variable_data.pop(DATA_PATH)
+            variable_data['fingerprint'] = await get_file_fingerprint(
+                path) if with_disk else None
+        data_by_id[variable_id] = variable_data
+    return get_fingerprint({
+        'tool': tool_fingerprint,
+        'data': data_by_id})
+
+
+def get_preset_differences(old_tool_definition, new_tool_definition):
+    old_fingerprint_by_slug = {
+        _.slug: _.fingerprint for _ in old_tool_definition.preset_definitions}
+    added_slugs, changed_slugs = [], []
+    for preset_definition in new_tool_definition.preset_definitions:
+        slug = preset_definition.slug
+        old_fingerprint = old_fingerprint_by_slug.pop(slug, None)
+        if old_fingerprint is None:
+            added_slugs.append(slug)
+        elif old_fingerprint != preset_definition.fingerprint:
+            changed_slugs.append(slug)
+    return {
+        'added': added_slugs,
+        'removed': list(old_fingerprint_by_slug),
+        'changed': changed_slugs}
+
+
+async def is_prepared_script(folder, preparation_map):
+    return await run_disk_function(
+        sync_is_prepared_script, folder, preparation_map)
+
+
+async def mark_prepared_script(folder, preparation_map):
+    await run_disk_function(sync_mark_prepared_script, folder, preparation_map)
+
+
+def sync_is_prepared_script(folder, preparation_map):
+    if 'target_path' not in preparation_map:
+        return True
+    source_fingerprint = get_source_fingerprint(folder, preparation_map)
+    if not source_fingerprint:
+        return False
+    target_path = Path(folder, preparation_map['target_path'])
+    stamp_path = get_stamp_path(target_path)
+    try:
+        return target_path.exists() and stamp_path.read_text(
+        ).strip() == source_fingerprint
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def sync_mark_prepared_script(folder, preparation_map):
+    source_fingerprint = get_source_fingerprint(folder, preparation_map)
+    if not source_fingerprint or 'target_path' not in preparation_map:
+        return
+    target_path = Path(folder, preparation_map['target_path'])
+    stamp_path = get_stamp_path(target_path)
+    temporary_path = stamp_path.with_name(stamp_path.name + '.tmp')
+    temporary_path.write_text(source_fingerprint + '\n')
+    temporary_path.replace(stamp_path)
+
+
+def get_source_fingerprint(folder, preparation_map):
+    if 'notebook_path' in preparation_map:
+        return sync_get_file_fingerprint(Path(
+            folder, preparation_map['notebook_path']))
+    return preparation_map.get('source_fingerprint')
+
+
+def get_stamp_path(target_path):
+    return target_path.with_name(target_path.name + '.fingerprint')
+
+
+async def get_file_fingerprint(path):
+    return await run_disk_function(sync_get_file_fingerprint, path)
+
+
+def sync_get_file_fingerprint(path):
+    try:
+        h = get_hash()
+        with open(path, 'rb') as f:  # noqa: PTH123
+            while chunk := f.read(FINGERPRINT_CHUNK_BYTE_COUNT):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def get_fingerprint(value):
+    text = json.dumps(
+        value, sort_keys=True, separators=(',', ':'), default=str)
+    h = get_hash()
+    h.update(text.encode())
+    return h.hexdigest()
+
+
+def get_hash():
+    return blake2b(digest_size=FINGERPRINT_BYTE_COUNT)
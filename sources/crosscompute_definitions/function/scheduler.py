@@ -0,0 +1,121 @@
+import asyncio
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+from os import getpid
+from threading import Lock
+
+from ..constant import (
+    IO_BACKGROUND_THREAD_COUNT,
+    IO_THREAD_COUNT,
+    IOPriority)
+
+
+class IOScheduler:
+
+    def __init__(self, thread_count=IO_THREAD_COUNT, limit_by_priority=None):
+        self.thread_count = thread_count
+        self.limit_by_priority = {
+            IOPriority.INTERACTIVE: thread_count,
+            IOPriority.BACKGROUND: IO_BACKGROUND_THREAD_COUNT,
+        } | (limit_by_priority or {})
+        self._reset(getpid())
+
+    async def run(self, f, *args, priority=None):
+        if priority is None:
+            priority = io_priority_variable.get()
+        executor = self._get_executor()
+        await self._acquire(priority)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, partial(copy_context().run, f, *args))
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiters = self._waiters_by_priority[priority]
+            if self._can_start(priority) and all(
+                    future.done() for _, future in waiters):
+                self._start(priority)
+                return
+            future = loop.create_future()
+            waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(priority)
+            raise
+
+    def _release(self, priority):
+        with self._lock:
+            self._running_count -= 1
+            self._running_count_by_priority[priority] -= 1
+            self._wake()
+
+    def _wake(self):
+        for priority in sorted(IOPriority, key=lambda _: _.value):
+            waiters = self._waiters_by_priority[priority]
+            while waiters and self._can_start(priority):
+                loop, future = waiters.popleft()
+                if future.done():
+                    continue
+                try:
+                    loop.call_soon_threadsafe(
+                        self._resolve, priority, future)
+                except RuntimeError:
+                    continue
+                self._start(priority)
+
+    def _resolve(self, priority, future):
+        if future.done():
+            self._release(priority)
+        else:
+            future.set_result(None)
+
+    def _start(self, priority):
+        self._running_count += 1
+        self._running_count_by_priority[priority] += 1
+
+    def _can_start(self, priority):
+        return self._running_count < self.thread_count and (
+            self._running_count_by_priority[priority] <
+            self.limit_by_priority[priority])
+
+    def _get_executor(self):
+        process_id = getpid()
+        if self._process_id != process_id:
+            self._reset(process_id)
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import (  # noqa: PLC0415
+                    ThreadPoolExecutor)
+                self._executor = ThreadPoolExecutor(
+                    self.thread_count, thread_name_prefix='crosscompute-io')
+        return self._executor
+
+    def _reset(self, process_id):
+        self._process_id = process_id
+        self._lock = Lock()
+        self._executor = None
+        self._running_count = 0
+        self._running_count_by_priority = Counter()
+        self._waiters_by_priority = {_: deque() for _ in IOPriority}
+
+
+@contextmanager
+def use_io_priority(priority):
+    token = io_priority_variable.set(priority)
+    try:
+        yield
+    finally:
+        io_priority_variable.reset(token)
+
+
+io_scheduler = IOScheduler()
+io_priority_variable = ContextVar(
+    'io_priority', default=IOPriority.INTERACTIVE)
@@ -0,0 +1,93 @@
+import pickle
+from os import replace
+from pathlib import Path
+
+from ..constant import (
+    PROTOCOL_VERSION,
+    SNAPSHOT_VERSION)
+from ..error import (
+    CrossComputeDataError)
+from .configuration import (
+    load_configuration)
+from .disk import (
+    get_path_state,
+    run_disk_function)
+
+
+async def load_configuration_with_snapshot(
+        path_or_folder, snapshot_path, **kwargs):
+    options = get_snapshot_options(**kwargs)
+    try:
+        tool_definition = await load_snapshot(snapshot_path, options)
+    except CrossComputeDataError:
+        tool_definition = await load_configuration(path_or_folder, **kwargs)
+        if not tool_definition.is_partial:
+            await tool_definition.finish_validation()
+            await save_snapshot(snapshot_path, tool_definition, options)
+    return tool_definition
+
+
+async def save_snapshot(path, tool_definition, options=None):
+    await run_disk_function(
+        sync_save_snapshot, path, tool_definition, options)
+    return path
+
+
+async def load_snapshot(path, options=None):
+    return await run_disk_function(sync_load_snapshot, path, options)
+
+
+def sync_save_snapshot(path, tool_definition, options=None):
+    path = Path(path)
+    header = get_snapshot_header(tool_definition.source_paths, options)
+    temporary_path = path.with_name(f'.{path.name}.tmp')
+    with temporary_path.open('wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(tool_definition, f, protocol=pickle.HIGHEST_PROTOCOL)
+    replace(temporary_path, path)  # noqa: PTH105
+
+
+def sync_load_snapshot(path, options=None):
+    try:
+        with Path(path).open('rb') as f:
+            header = pickle.load(f)  # noqa: S301
+            if not is_current_snapshot_header(header, options):
+                x = 'snapshot is outdated'
+                raise CrossComputeDataError(x, path=path)
+            tool_definition = pickle.load(f)  # noqa: S301
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        x = f'snapshot is not accessible; {e}'
+        raise CrossComputeDataError(x, path=path) from e
+    return tool_definition
+
+
+def get_snapshot_options(
+        locus='0', *, with_disk=True, with_outline=False, **_):
+    return {
+        'locus': locus,
+        'with_disk': with_disk,
+        'with_outline': with_outline}
+
+
+def get_snapshot_header(source_paths, options=None):
+    return {
+        'snapshot_version': SNAPSHOT_VERSION,
+        'protocol_version': PROTOCOL_VERSION,
+        'options': options,
+        'source_states': [(_, get_path_state(_)) for _ in dict.fromkeys(
+            str(_) for _ in source_paths)]}
+
+
+def is_current_snapshot_header(header, options=None):
+    try:
+        if header['snapshot_version'] != SNAPSHOT_VERSION:
+            return False
+        if header['protocol_version'] != PROTOCOL_VERSION:
+            return False
+        if header['options'] != options:
+            return False
+        source_states = header['source_states']
+    except (KeyError, TypeError):
+        return False
+    return all(get_path_state(
+        path) == state for path, state in source_states)
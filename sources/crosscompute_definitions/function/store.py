@@ -0,0 +1,113 @@
+import pickle
+from mmap import ACCESS_READ, mmap
+from os import replace
+from pathlib import Path
+
+from crosscompute_macros.iterable import (
+    LRUDict,
+    find_item)
+
+from ..constant import (
+    STORE_CACHE_LENGTH)
+from ..error import (
+    CrossComputeDataError)
+from .disk import (
+    run_disk_function)
+from .snapshot import (
+    get_snapshot_header,
+    is_current_snapshot_header)
+
+
+class DefinitionStore:
+
+    def __init__(self, path, header, buffer, offset):
+        self.path = path
+        self.header = header
+        self.tool_entries = header['tool_entries']
+        self._buffer = buffer
+        self._offset = offset
+        self._tool_definition_by_index = LRUDict(length=STORE_CACHE_LENGTH)
+
+    def get_tool_definition(self, tool_slug=None, tool_locus=None):
+        if tool_locus:
+            key, value = 'locus', tool_locus
+        else:
+            key, value = 'slug', tool_slug
+        try:
+            tool_entry = find_item(
+                self.tool_entries, key, value,
+                get_value=lambda item, key: item[key])
+        except StopIteration as e:
+            x = f'tool {key} "{value}" was not found'
+            raise CrossComputeDataError(x, path=self.path) from e
+        index = tool_entry['index']
+        d = self._tool_definition_by_index
+        if index not in d:
+            a = self._offset + tool_entry['offset']
+            b = a + tool_entry['byte_count']
+            d[index] = pickle.loads(self._buffer[a:b])  # noqa: S301
+        return d[index]
+
+    def is_current(self):
+        return is_current_snapshot_header(self.header)
+
+    def close(self):
+        self._tool_definition_by_index.clear()
+        self._buffer.close()
+
+
+async def save_definition_store(path, kit_definition):
+    await run_disk_function(sync_save_definition_store, path, kit_definition)
+    return path
+
+
+async def load_definition_store(path):
+    return await run_disk_function(sync_load_definition_store, path)
+
+
+def sync_save_definition_store(path, kit_definition):
+    path = Path(path)
+    header = get_snapshot_header(kit_definition.source_paths)
+    tool_entries = header['tool_entries'] = []
+    tool_payloads = []
+    offset = 0
+    for index, tool_definition in enumerate(kit_definition.tool_definitions):
+        payload = pickle.dumps(
+            tool_definition, protocol=pickle.HIGHEST_PROTOCOL)
+        tool_entries.append({
+            'index': index,
+            'name': tool_definition.name,
+            'slug': tool_definition.slug,
+            'locus': tool_definition.locus,
+            'offset': offset,
+            'byte_count': len(payload)})
+        tool_payloads.append(payload)
+        offset += len(payload)
+    header_payload = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary_path = path.with_name(f'.{path.name}.tmp')
+    with temporary_path.open('wb') as f:
+        f.write(len(header_payload).to_bytes(
+            HEADER_LENGTH_BYTE_COUNT, 'big'))
+        f.write(header_payload)
+        for payload in tool_payloads:
+            f.write(payload)
+    replace(temporary_path, path)  # noqa: PTH105
+
+
+def sync_load_definition_store(path):
+    try:
+        with Path(path).open('rb') as f:
+            buffer = mmap(f.fileno(), 0, access=ACCESS_READ)
+        a = HEADER_LENGTH_BYTE_COUNT
+        b = a + int.from_bytes(buffer[:a], 'big')
+        header = pickle.loads(buffer[a:b])  # noqa: S301
+        definition_store = DefinitionStore(path, header, buffer, b)
+    except (
+        OSError, EOFError, ValueError, KeyError, pickle.UnpicklingError,
+    ) as e:
+        x = f'definition store is not accessible; {e}'
+        raise CrossComputeDataError(x, path=path) from e
+    return definition_store
+
+
+HEADER_LENGTH_BYTE_COUNT = 8
@@ -1,28 +1,48 @@
+from hashlib import blake2b
 from logging import getLogger
-from os.path import join, splitext
+from os.path import join
+from pathlib import PurePath
 
-from crosscompute_macros.disk import (
-    FileCache,
-    get_byte_count,
-    is_existing_path,
-    load_raw_json,
-    load_raw_text)
 from crosscompute_macros.error import (
     DiskError,
     ParsingError)
-from crosscompute_views.base import (
-    LoadableVariableView)
+from crosscompute_macros.iterable import (
+    LRUDict)
 
 from ..constant import (
+    CHANGE_TOKEN_CACHE_LENGTH,
     DATA_CONFIGURATION,
     DATA_PATH,
+    DATA_PREVIEW,
     DATA_VALUE,
+    ERROR_DATA_NOT_FOUND,
+    FOLDER_NAMES_CACHE_LENGTH,
+    MISSING_DATA_CACHE_LENGTH,
+    PATH_TEMPLATE_PATTERN,
+    PREVIEW_BYTE_COUNT,
     RAW_DATA_BYTE_COUNT,
-    RAW_DATA_CACHE_LENGTH)
+    RAW_DATA_CACHE_LENGTH,
+    DataStatus)
 from ..error import (
     CrossComputeDataError)
+from .cache import (
+    DataCache)
 from .disk import (
-    get_matching_paths)
+    add_source_path,
+    get_compressed_path,
+    get_compression_suffix,
+    get_data_suffix,
+    get_matching_paths,
+    get_path_template_pattern,
+    is_existing_path,
+    list_paths,
+    load_folder_snapshot,
+    load_path_state,
+    load_raw_bytes,
+    parse_feature_preview,
+    parse_raw_json,
+    parse_raw_text,
+    parse_text_preview)
 
 
 async def load_variable_data_by_id(folder, variables):
@@ -40,6 +60,181 @@ async def load_variable_data_by_id(folder, variables):
     return data_by_id
 
 
+async def load_variable_status_by_id(folder, variables):
+    data_by_id = {}
+    status_by_id = {}
+    for variable in variables:
+        path_name = variable.path_name
+        if path_name == 'ENVIRONMENT':
+            continue
+        variable_id = variable.id
+        status, variable_data = await load_variable_status(folder, variable)
+        status_by_id[variable_id] = status
+        if variable_data is not None:
+            data_by_id[variable_id] = variable_data
+    return data_by_id, status_by_id
+
+
+async def load_variable_status(folder, variable):
+    path = PurePath(folder, variable.path_name)
+    if await is_missing_variable_path(path):
+        return DataStatus.MISSING, None
+    try:
+        variable_data = await load_variable_data(folder, variable)
+    except CrossComputeDataError as e:
+        L.debug(e)
+        if getattr(e, 'code', None) == ERROR_DATA_NOT_FOUND:
+            return DataStatus.MISSING, None
+        return DataStatus.PARSE_ERROR, None
+    if DATA_VALUE in variable_data or PATH_TEMPLATE_PATTERN.search(
+            str(variable_data[DATA_PATH])):
+        return DataStatus.READY, variable_data
+    if get_data_suffix(variable_data[DATA_PATH]) in INLINE_DATA_SUFFIXES:
+        return DataStatus.TOO_LARGE, variable_data
+    return DataStatus.READY, variable_data
+
+
+async def is_missing_variable_path(path):
+    key = str(path)
+    d = missing_data_cache
+    state, names = await load_cached_folder_names(path.parent)
+    if state is not None and d.get(key) == state:
+        return True
+    if names:
+        pattern = get_path_template_pattern(path.name)
+        for name in names:
+            suffix = get_compression_suffix(name)
+            if suffix:
+                name = name[:-len(suffix)]
+            if pattern.match(name):
+                return False
+    if state is not None:
+        d[key] = state
+    return True
+
+
+async def load_changed_variable_data_by_id(
+        folder, variables, change_token=None):
+    state_by_id = await get_variable_state_by_id(folder, variables)
+    new_change_token = get_change_token(folder, state_by_id)
+    if change_token == new_change_token:
+        return {
+            'change_token': change_token,
+            'is_modified': False,
+            'variable_ids': [],
+            'data_by_id': {}}
+    old_state_by_id = variable_state_cache.get(change_token, {})
+    variable_state_cache[new_change_token] = state_by_id
+    changed_variables = [_ for _ in variables if _.id in state_by_id and (
+        state_by_id[_.id] != old_state_by_id.get(_.id))]
+    data_by_id = await load_variable_data_by_id(folder, changed_variables)
+    return {
+        'change_token': new_change_token,
+        'is_modified': True,
+        'variable_ids': [_.id for _ in changed_variables],
+        'data_by_id': data_by_id}
+
+
+async def get_variable_state_by_id(folder, variables):
+    snapshot_by_folder = {}
+    state_by_id = {}
+    for variable in variables:
+        path_name = variable.path_name
+        if path_name == 'ENVIRONMENT':
+            continue
+        path = PurePath(folder, path_name)
+        variable_folder = path.parent
+        if variable_folder not in snapshot_by_folder:
+            snapshot_by_folder[variable_folder] = await load_folder_snapshot(
+                variable_folder)
+        folder_snapshot = snapshot_by_folder[variable_folder] or ()
+        prefix = path.name.split('{')[0]
+        states = [_ for _ in folder_snapshot if _[0].startswith(prefix)]
+        variable_configuration = variable.configuration
+        if 'path' in variable_configuration:
+            states.append(await load_path_state(join(  # noqa: PTH118
+                folder, variable_configuration['path'])))
+        state_by_id[variable.id] = tuple(states)
+    return state_by_id
+
+
+def get_change_token(folder, state_by_id):
+    text = repr((str(folder), sorted(state_by_id.items())))
+    return blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+async def load_indexed_paths(folder, variable, *, offset=0, limit=None):
+    indexed_paths = await load_indexed_entries(folder, variable)
+    stop = None if limit is None else offset + limit
+    entries = []
+    for index, path in indexed_paths[offset:stop]:
+        state = await load_path_state(path)
+        entries.append({
+            'index': index,
+            DATA_PATH: path,
+            'byte_count': None if state is None else state[1]})
+    return {
+        'count': len(indexed_paths),
+        'entries': entries}
+
+
+async def iterate_indexed_data(folder, variable, *, offset=0, limit=None):
+    indexed_paths = await load_indexed_entries(folder, variable)
+    stop = None if limit is None else offset + limit
+    for index, path in indexed_paths[offset:stop]:
+        try:
+            raw_bytes = await load_raw_bytes(path)
+        except DiskError as e:
+            raise CrossComputeDataError(e, variable_id=variable.id) from e
+        yield index, path, raw_bytes
+
+
+async def load_indexed_entries(folder, variable):
+    path = PurePath(folder, variable.path_name)
+    variable_folder = path.parent
+    _, names = await load_cached_folder_names(variable_folder)
+    if names is None:
+        x = 'folder does not exist'
+        raise CrossComputeDataError(
+            x, path=variable_folder, variable_id=variable.id)
+    key = str(path)
+    d = indexed_entries_cache
+    if key in d:
+        old_names, indexed_paths = d[key]
+        if old_names is names:
+            return indexed_paths
+    pattern = get_path_template_pattern(path.name)
+    indexed_paths = []
+    for name in names:
+        match = pattern.match(name)
+        if not match:
+            continue
+        index_string = match.groupdict().get('index')
+        index = int(index_string) if index_string else 0
+        indexed_paths.append((index, str(variable_folder / name)))
+    indexed_paths.sort()
+    d[key] = names, indexed_paths
+    return indexed_paths
+
+
+async def load_cached_folder_names(folder):
+    folder = str(folder)
+    state = await load_path_state(folder)
+    if state is None:
+        return None, None
+    d = folder_names_cache
+    if folder in d:
+        old_state, names = d[folder]
+        if state == old_state:
+            return state, names
+    try:
+        names = await list_paths(folder)
+    except OSError:
+        return None, None
+    d[folder] = state, names
+    return state, names
+
+
 async def load_variable_data(
         folder, variable, *, with_configuration_path=True):
     variable_path = variable.path_name
@@ -47,8 +242,9 @@ async def load_variable_data(
     if '{index}' in variable_path:
         return {DATA_PATH: path}
     variable_id = variable.id
+    data_limits = get_data_limits(variable.configuration)
     try:
-        raw_data = await raw_data_cache.get(path)
+        raw_data = await load_cached_raw_data(path, data_limits)
     except CrossComputeDataError as e:
         e.variable_id = variable_id
         raise
@@ -60,24 +256,37 @@ async def load_variable_data(
             variable_data, folder, variable, variable_value_by_id,
             with_configuration_path)
     elif with_configuration_path:
-        variable_data = raw_data
+        variable_data = raw_data.copy()
         await restore_data_configuration(
             variable_data, folder, variable, {}, with_configuration_path)
     else:
-        variable_data = raw_data
+        variable_data = raw_data.copy()
     if DATA_VALUE in variable_data:
-        variable_data[DATA_VALUE] = await LoadableVariableView.get_from(
+        variable_data[DATA_VALUE] = await get_variable_view(
             variable).parse(variable_data[DATA_VALUE])
     return variable_data
 
 
+def get_variable_view(variable):
+    try:
+        return variable.view
+    except AttributeError:
+        return load_variable_view(variable)
+
+
+def load_variable_view(variable):
+    from crosscompute_views.base import (  # noqa: PLC0415
+        LoadableVariableView)
+    return LoadableVariableView.get_from(variable)
+
+
 def load_variable_data_from(variable_value_by_id, variable_id):
     try:
         variable_value = variable_value_by_id[variable_id]
     except KeyError as e:
         x = 'value was not found'
         raise CrossComputeDataError(
-            x, variable_id=variable_id) from e
+            x, variable_id=variable_id, code=ERROR_DATA_NOT_FOUND) from e
     return {DATA_VALUE: variable_value}
 
 
@@ -95,8 +304,10 @@ async def restore_data_configuration(
             data_configuration.update(v)
         else:
             L.error(f'data configuration must be a dictionary; {variable_id=}')
-    elif with_configuration_path and await is_existing_path(default_path):
-        await update_data_configuration(data_configuration, default_path)
+    elif with_configuration_path:
+        add_source_path(default_path)
+        if await is_existing_path(default_path):
+            await update_data_configuration(data_configuration, default_path)
     if 'path' in variable_configuration:
         custom_path = join(  # noqa: PTH118
             folder, variable_configuration['path'])
@@ -107,39 +318,63 @@ async def restore_data_configuration(
 
 async def update_data_configuration(data_configuration, path):
     try:
-        data_configuration.update(await load_raw_json(path))
+        data_configuration.update(parse_raw_json(
+            await load_raw_bytes(path), path))
     except (DiskError, ParsingError) as e:
         L.error(e)
 
 
-async def load_raw_data(path):
+async def load_cached_raw_data(path, data_limits=None):
+    if data_limits is None:
+        data_limits = get_data_limits({})
+    try:
+        raw_data = await raw_data_cache.get(path, data_limits)
+    except CrossComputeDataError:
+        compressed_path = await get_compressed_path(path)
+        if not compressed_path:
+            raise
+        raw_data = await raw_data_cache.get(compressed_path, data_limits)
+    return raw_data
+
+
+async def load_raw_data(path, data_limits=None):
+    if data_limits is None:
+        data_limits = get_data_limits({})
     try:
         matching_paths = await get_matching_paths(path)
     except OSError as e:
         x = 'path does not exist'
-        raise CrossComputeDataError(x, path=path) from e
+        raise CrossComputeDataError(
+            x, path=path, code=ERROR_DATA_NOT_FOUND) from e
     match len(matching_paths):
         case 0:
             x = 'path does not exist'
-            raise CrossComputeDataError(x, path=path)
+            raise CrossComputeDataError(
+                x, path=path, code=ERROR_DATA_NOT_FOUND)
         case 1:
             path = matching_paths[0]
         case _:
             return {DATA_PATH: path}
-    suffix = splitext(path)[1]  # noqa: PTH122
+    suffix = get_data_suffix(path)
     if suffix == '.dictionary':
         return await load_dictionary_data(path)
-    if suffix in ['.md', '.txt']:
-        return await load_file_data(path, load_raw_text)
-    if suffix in ['.geojson', '.json']:
-        return await load_file_data(path, load_raw_json)
+    if suffix in TEXT_DATA_SUFFIXES:
+        return await load_file_data(
+            path, parse_raw_text, data_limits, get_text_preview)
+    if suffix == '.geojson':
+        return await load_file_data(
+            path, parse_raw_json, data_limits, get_feature_preview)
+    if suffix == '.json':
+        return await load_file_data(path, parse_raw_json, data_limits)
     return {DATA_PATH: path}
 
 
 async def load_dictionary_data(path):
     try:
-        value = await load_raw_json(path)
-    except (DiskError, ParsingError) as e:
+        value = parse_raw_json(await load_raw_bytes(path), path)
+    except DiskError as e:
+        raise CrossComputeDataError(e, code=ERROR_DATA_NOT_FOUND) from e
+    except ParsingError as e:
         raise CrossComputeDataError(e) from e
     if not isinstance(value, dict):
         x = 'dictionary expected'
@@ -147,18 +382,56 @@ async def load_dictionary_data(path):
     return {DATA_VALUE: value}
 
 
-async def load_file_data(path, load):
+async def load_file_data(path, parse, data_limits, get_preview=None):
+    inline_byte_count, preview_byte_count = data_limits[:2]
+    if not get_preview:
+        preview_byte_count = None
+    byte_count = max(inline_byte_count + 1, preview_byte_count or 0)
     try:
-        byte_count = await get_byte_count(path)
-        if byte_count > RAW_DATA_BYTE_COUNT:
-            return {DATA_PATH: path}
-        value = await load(path)
-    except (DiskError, ParsingError) as e:
+        raw_bytes = await load_raw_bytes(path, byte_count)
+        if len(raw_bytes) > inline_byte_count:
+            data = {DATA_PATH: path}
+            if preview_byte_count:
+                data[DATA_PREVIEW] = get_preview(
+                    raw_bytes[:preview_byte_count], path, data_limits)
+            return data
+        value = parse(raw_bytes, path)
+    except DiskError as e:
+        raise CrossComputeDataError(e, code=ERROR_DATA_NOT_FOUND) from e
+    except ParsingError as e:
         raise CrossComputeDataError(e) from e
     return {DATA_VALUE: value}
 
 
-raw_data_cache = FileCache(
+def get_text_preview(raw_bytes, path, data_limits):
+    return parse_text_preview(raw_bytes, path, data_limits[2])
+
+
+def get_feature_preview(raw_bytes, path, data_limits):
+    return parse_feature_preview(raw_bytes, path, data_limits[3])
+
+
+def get_data_limits(variable_configuration):
+    c = variable_configuration
+    inline_byte_count = c.get('inline-byte-count', RAW_DATA_BYTE_COUNT)
+    preview_byte_count = c.get('preview-byte-count')
+    preview_line_count = c.get('preview-line-count')
+    preview_feature_count = c.get('preview-feature-count')
+    if not preview_byte_count and (
+            preview_line_count or preview_feature_count):
+        preview_byte_count = PREVIEW_BYTE_COUNT
+    return (
+        inline_byte_count, preview_byte_count, preview_line_count,
+        preview_feature_count)
+
+
+raw_data_cache = DataCache(
     load=load_raw_data,
     length=RAW_DATA_CACHE_LENGTH)
+TEXT_DATA_SUFFIXES = ['.md', '.txt']
+INLINE_DATA_SUFFIXES = [*TEXT_DATA_SUFFIXES, '.geojson', '.json']
+missing_data_cache = LRUDict(length=MISSING_DATA_CACHE_LENGTH)
+variable_state_cache = LRUDict(length=CHANGE_TOKEN_CACHE_LENGTH)
+folder_names_cache = LRUDict(length=FOLDER_NAMES_CACHE_LENGTH)
+indexed_entries_cache = LRUDict(length=FOLDER_NAMES_CACHE_LENGTH)
 L = getLogger(__name__)
@@ -1,16 +1,170 @@
+import pickle
+
 import aiofiles
 import pytest
 
 from crosscompute_macros.disk import (
     make_soft_link,
     remove_path)
+from crosscompute_views.base import (
+    LoadableVariableView)
 
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION)
 from crosscompute_definitions.error import (
     CrossComputeConfigurationError)
 from crosscompute_definitions.function.configuration import (
     Definition,
+    configuration_name_cache,
+    load_configuration,
+    load_tool_configuration,
     validate_paths,
     validate_steps)
+from crosscompute_definitions.setting import (
+    view_by_name)
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_from_folder(tmp_path):
+    async with aiofiles.open(tmp_path / 'a.yaml', 'wt') as f:
+        await f.write('crosscompute_data: 1\n')
+    async with aiofiles.open(tmp_path / 'b.yaml', 'wt') as f:
+        await f.write(f'---\ncrosscompute: {PROTOCOL_VERSION}\n')
+    configuration = await load_configuration(tmp_path)
+    assert configuration.absolute_path == str(tmp_path / 'b.yaml')
+    assert configuration_name_cache[str(tmp_path)][1] == 'b.yaml'
+    configuration = await load_configuration(tmp_path)
+    assert configuration.absolute_path == str(tmp_path / 'b.yaml')
+    folder = tmp_path / 'c'
+    folder.mkdir()
+    async with aiofiles.open(folder / 'c.yaml', 'wt') as f:
+        await f.write(f'{{name: C, "crosscompute": {PROTOCOL_VERSION}}}\n')
+    configuration = await load_configuration(folder)
+    assert configuration.name == 'C'
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_without_disk(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'tools:\n'
+            '  - path: x/automate.yaml\n'
+            'datasets:\n'
+            '  - path: d.csv\n'
+            '    reference:\n'
+            '      path: x/d.csv\n'
+            'execution:\n'
+            '  setup:\n'
+            '    root:\n'
+            '      path: x/setup.sh\n')
+    with pytest.raises(CrossComputeConfigurationError):
+        await load_configuration(path)
+    configuration = await load_configuration(path, with_disk=False)
+    assert configuration.is_partial
+    for path_text in ['[]', '../../etc/x', '/etc/x']:
+        async with aiofiles.open(path, 'wt') as f:
+            await f.write(
+                f'crosscompute: {PROTOCOL_VERSION}\n'
+                'datasets:\n'
+                f'  - path: {path_text}\n')
+        with pytest.raises(CrossComputeConfigurationError):
+            await load_configuration(path, with_disk=False)
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_with_lazy(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'execution:\n'
+            '  setup:\n'
+            '    root:\n'
+            '      path: setup.sh\n')
+    configuration = await load_configuration(path, with_lazy=True)
+    assert not hasattr(configuration, 'execution_definition')
+    with pytest.raises(CrossComputeConfigurationError) as e:
+        await configuration.get_execution_definition()
+    assert e.value.path == str(path)
+    async with aiofiles.open(tmp_path / 'setup.sh', 'wt') as f:
+        await f.write('')
+    configuration = await load_configuration(path, with_lazy=True)
+    execution_definition = await configuration.get_execution_definition()
+    assert execution_definition.engine_name
+    assert configuration.execution_definition is execution_definition
+    await configuration.finish_validation()
+    assert configuration.display_definition.page_definitions == []
+
+
+@pytest.mark.asyncio
+async def test_load_tool_configuration(tmp_path):
+    async with aiofiles.open(tmp_path / 'automate.yaml', 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'tools:\n'
+            '  - path: a.yaml\n'
+            '  - path: b.yaml\n')
+    for name in 'a', 'b':
+        async with aiofiles.open(tmp_path / f'{name}.yaml', 'wt') as f:
+            await f.write(
+                f'crosscompute: {PROTOCOL_VERSION}\n'
+                f'slug: {name}\n'
+                'output:\n'
+                'presets:\n'
+                '  - folder: p\n')
+    tool_definition = await load_tool_configuration(tmp_path, tool_slug='b')
+    assert tool_definition.locus == '0-1'
+    assert not tool_definition.is_partial
+    tool_definition = await load_tool_configuration(tmp_path, tool_locus='0-0')
+    assert tool_definition.slug == 'a'
+    with pytest.raises(CrossComputeConfigurationError):
+        await load_tool_configuration(tmp_path, tool_slug='c')
+    (tmp_path / 'l').symlink_to('/')
+    async with aiofiles.open(tmp_path / 'automate.yaml', 'at') as f:
+        await f.write('datasets:\n  - path: l\n')
+    with pytest.raises(CrossComputeConfigurationError):
+        await load_tool_configuration(tmp_path, tool_slug='b')
+    tool_definition = await load_tool_configuration(
+        tmp_path, tool_slug='b', with_disk=False)
+    assert tool_definition.locus == '0-1'
+    assert tool_definition.is_partial
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_with_variable_view(tmp_path, monkeypatch):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'input:\n'
+            '  variables:\n'
+            '    - id: a\n'
+            '      view: number\n'
+            '      path: a.txt\n'
+            'log:\n'
+            '  variables:\n'
+            '    - id: a\n'
+            '      view: number\n'
+            '      path: a{index}.txt\n')
+    monkeypatch.setitem(view_by_name, 'number', LoadableVariableView)
+    configuration = await load_configuration(path)
+    variable_definition = configuration.get_variable_definitions(
+        'input')[0]
+    assert variable_definition.view.variable is variable_definition
+    assert configuration.get_variable_definition(
+        'input', 'a') is variable_definition
+    assert len(configuration.find_variable_definitions('a')) == 2
+    assert configuration.match_variable_definition(
+        'input', 'a.txt.gz') is variable_definition
+    assert configuration.match_variable_definition(
+        'log', 'a12.txt').step_name == 'log'
+    assert configuration.match_variable_definition('log', 'a.txt') is None
+    configuration = pickle.loads(pickle.dumps(configuration))  # noqa: S301
+    variable_definition = configuration.get_variable_definitions(
+        'input')[0]
+    assert variable_definition.view.variable is variable_definition
 
 
 @pytest.mark.asyncio
@@ -36,6 +190,15 @@ async def test_validate_paths(tmpdir):
     async with aiofiles.open(tmpdir / 'a', 'wt') as f:
         await f.write('A')
     await validate_paths(definition)
+    definition['xs'][0]['path'] = str(tmpdir) + 'x'
+    with pytest.raises(CrossComputeConfigurationError):
+        await validate_paths(definition)
+    definition['xs'] = [{'configuration': {
+        'path': 'a', 'x': {'path': []}}}]
+    await validate_paths(definition)
+    definition['xs'][0]['configuration']['path'] = '../a'
+    with pytest.raises(CrossComputeConfigurationError):
+        await validate_paths(definition)
 
 
 @pytest.mark.asyncio
@@ -52,3 +215,6 @@ async def test_validate_steps():
                 ],
             },
         })
+
+
+# ruff: noqa: S101
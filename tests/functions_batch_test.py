@@ -0,0 +1,50 @@
+import time
+from multiprocessing import get_start_method
+
+import aiofiles
+import pytest
+
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION)
+from crosscompute_definitions.function.batch import (
+    validate_configurations)
+
+
+@pytest.mark.asyncio
+async def test_validate_configurations(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(f'crosscompute: {PROTOCOL_VERSION}\n')
+    results = await validate_configurations(
+        [path, tmp_path / 'x.yaml'], process_count=2,
+        snapshot_folder=tmp_path)
+    assert results[0]['is_valid']
+    assert not results[1]['is_valid']
+    assert 'message' in results[1]['error']
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    get_start_method() != 'fork', reason='patch must reach the workers')
+async def test_validate_configurations_with_timeout(tmp_path, monkeypatch):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(f'crosscompute: {PROTOCOL_VERSION}\n')
+
+    async def validate_configuration(path, snapshot_path):
+        if path.endswith('x.yaml'):
+            time.sleep(60)  # noqa: ASYNC251
+
+    monkeypatch.setattr(
+        'crosscompute_definitions.function.batch.validate_configuration',
+        validate_configuration)
+    results = await validate_configurations(
+        [tmp_path / 'x.yaml', path, path], process_count=1,
+        timeout_in_seconds=0.5)
+    assert not results[0]['is_valid']
+    assert 'seconds' in results[0]['error']['message']
+    assert results[1]['is_valid']
+    assert results[2]['is_valid']
+
+
+# ruff: noqa: S101
@@ -0,0 +1,69 @@
+import asyncio
+import pickle
+import sqlite3
+
+import pytest
+
+from crosscompute_definitions.function.cache import (
+    DataCache,
+    SharedDataCache)
+from crosscompute_definitions.function.disk import (
+    get_path_state)
+
+
+@pytest.mark.asyncio
+async def test_shared_data_cache(tmp_path):
+    path = tmp_path / 'x.txt'
+    path.write_text('x')
+    load_count = 0
+
+    async def load(path):
+        nonlocal load_count
+        load_count += 1
+        return {'value': load_count}
+
+    shared_cache = SharedDataCache(tmp_path / 'cache.sqlite')
+    data_cache = DataCache(load=load, length=1, shared_cache=shared_cache)
+    assert await data_cache.get(path) == {'value': 1}
+    assert await data_cache.get(path) == {'value': 1}
+    data_cache = DataCache(load=load, length=1, shared_cache=shared_cache)
+    assert await data_cache.get(path) == {'value': 1}
+    assert load_count == 1
+    path.write_text('xx')
+    assert await data_cache.get(path) == {'value': 2}
+    shared_cache.byte_count = len(pickle.dumps(
+        {'value': 0}, protocol=pickle.HIGHEST_PROTOCOL))
+    shared_cache.sync_set('y', (0, 0), {'value': 0})
+    assert shared_cache.sync_get('y', (0, 0)) == {'value': 0}
+    assert shared_cache.sync_get(str(path), get_path_state(path)) is None
+    connection = sqlite3.connect(shared_cache.path)
+    assert connection.execute('SELECT byte_count FROM total').fetchone() == (
+        shared_cache.byte_count,)
+    connection.close()
+    shared_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_data_cache_coalescing(tmp_path):
+    path = tmp_path / 'x.txt'
+    path.write_text('x')
+    load_count = 0
+    event = asyncio.Event()
+
+    async def load(path):
+        nonlocal load_count
+        load_count += 1
+        await event.wait()
+        return {'value': load_count}
+
+    data_cache = DataCache(load=load, length=1)
+    tasks = [asyncio.create_task(data_cache.get(path)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    tasks[0].cancel()
+    event.set()
+    values = await asyncio.gather(*tasks[1:])
+    assert values == [{'value': 1}] * 2
+    assert load_count == 1
+
+
+# ruff: noqa: S101
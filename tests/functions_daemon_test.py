@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import suppress
+
+import aiofiles
+import pytest
+
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION,
+    IOPriority)
+from crosscompute_definitions.error import (
+    CrossComputeConfigurationError,
+    CrossComputeError)
+from crosscompute_definitions.function import (
+    configuration)
+from crosscompute_definitions.function.daemon import (
+    DefinitionClient,
+    DefinitionServer,
+    read_frame,
+    serve_definitions,
+    write_frame)
+from crosscompute_definitions.function.scheduler import (
+    io_priority_variable)
+
+
+@pytest.mark.asyncio
+async def test_definition_client(tmp_path, monkeypatch):
+    path = tmp_path / 'automate.yaml'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'slug: a\n'
+            'output:\n'
+            'presets:\n'
+            '  - folder: p\n')
+    socket_path = tmp_path / 'd.sock'
+    task = asyncio.create_task(serve_definitions(socket_path))
+    while not socket_path.exists():  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+    definition_client = DefinitionClient(socket_path)
+    tool_definition = await definition_client.load_configuration(path)
+    assert tool_definition.slug == 'a'
+    preset_maps = await definition_client.get_preset_maps(
+        path, tool_slug='a')
+    assert preset_maps[0]['folder'] == 'p'
+    with pytest.raises(CrossComputeConfigurationError):
+        await definition_client.load_configuration(tmp_path / 'x.yaml')
+    assert socket_path.stat().st_mode & 0o777 == 0o600
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    await write_frame(writer, ['load_configuration'])
+    assert isinstance((await read_frame(reader))['error'], CrossComputeError)
+    writer.close()
+
+    async def get_preset_maps(self, path_or_folder, **kwargs):
+        return lambda: path_or_folder
+
+    monkeypatch.setattr(DefinitionServer, 'get_preset_maps', get_preset_maps)
+    with pytest.raises(CrossComputeError):
+        await definition_client.get_preset_maps(path)
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_definition_server_revalidate(tmp_path, monkeypatch):
+    priorities = []
+
+    async def load_configuration(*args, **kwargs):
+        priorities.append(io_priority_variable.get())
+        return await configuration.load_configuration(*args, **kwargs)
+
+    monkeypatch.setattr(
+        'crosscompute_definitions.function.daemon.load_configuration',
+        load_configuration)
+    path = tmp_path / 'automate.yaml'
+    text = (
+        f'crosscompute: {PROTOCOL_VERSION}\n'
+        'slug: {slug}\n')
+    path.write_text(text.replace('{slug}', 'a'))
+    definition_server = DefinitionServer()
+    tool_definition = await definition_server.load_configuration(path)
+    assert tool_definition.slug == 'a'
+    path.write_text(text.replace('{slug}', 'bb'))
+    tool_definition = await definition_server.load_configuration(path)
+    assert tool_definition.slug == 'a'
+    await definition_server.revalidate()
+    tool_definition = await definition_server.load_configuration(path)
+    assert tool_definition.slug == 'bb'
+    assert priorities == [IOPriority.INTERACTIVE, IOPriority.BACKGROUND]
+
+
+# ruff: noqa: S101
@@ -0,0 +1,39 @@
+import aiofiles
+import pytest
+
+from crosscompute_macros.disk import (
+    remove_path)
+
+from crosscompute_definitions.function.disk import (
+    PathCache,
+    is_contained_path,
+    is_file_path,
+    use_path_cache)
+
+
+@pytest.mark.asyncio
+async def test_path_cache(tmp_path):
+    path = tmp_path / 'a'
+    async with aiofiles.open(path, mode='wt') as f:
+        await f.write('A')
+    with use_path_cache():
+        assert await is_file_path(path)
+        await remove_path(path)
+        assert await is_file_path(path)
+    assert not await is_file_path(path)
+    path_cache = PathCache(duration_in_seconds=0)
+    with use_path_cache(path_cache):
+        assert not await is_file_path(path)
+        async with aiofiles.open(path, mode='wt') as f:
+            await f.write('A')
+        assert await is_file_path(path)
+
+
+def test_is_contained_path():
+    for path in ['a', 'a/../b', '.', '_x']:
+        assert is_contained_path(path)
+    for path in ['..', '../_x', 'a/../../b', '/a']:
+        assert not is_contained_path(path)
+
+
+# ruff: noqa: S101
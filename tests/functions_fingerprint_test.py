@@ -0,0 +1,114 @@
+import shutil
+
+import pytest
+
+from crosscompute_views.base import (
+    LoadableVariableView)
+
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION)
+from crosscompute_definitions.function.configuration import (
+    load_configuration)
+from crosscompute_definitions.function.fingerprint import (
+    get_preset_differences,
+    get_tool_fingerprint,
+    is_prepared_script,
+    mark_prepared_script)
+from crosscompute_definitions.setting import (
+    view_by_name)
+
+
+@pytest.mark.asyncio
+async def test_preset_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setitem(view_by_name, 'text', LoadableVariableView)
+    path = tmp_path / 'automate.yaml'
+    path.write_text(
+        f'crosscompute: {PROTOCOL_VERSION}\n'
+        'input:\n'
+        '  variables:\n'
+        '    - id: x\n'
+        '      view: text\n'
+        '      path: x.txt\n'
+        'output:\n'
+        'presets:\n'
+        '  - folder: p/{x}\n'
+        '    configuration:\n'
+        '      path: p.csv\n'
+        'scripts:\n'
+        '  - path: run.py\n')
+    (tmp_path / 'p.csv').write_text('x\n1\n2\n')
+    (tmp_path / 'run.py').write_text('')
+    configuration = await load_configuration(path)
+    preset_definitions = configuration.preset_definitions
+    fingerprint = preset_definitions[0].fingerprint
+    source_paths = list(configuration.source_paths)
+    assert str(tmp_path / 'run.py') in [str(_) for _ in source_paths]
+    await get_tool_fingerprint(configuration)
+    assert configuration.source_paths == source_paths
+    assert len(fingerprint) == 32
+    assert preset_definitions[1].fingerprint != fingerprint
+    configuration = await load_configuration(path)
+    assert configuration.preset_definitions[0].fingerprint == fingerprint
+    copy_path = tmp_path.parent / (tmp_path.name + '-copy')
+    shutil.copytree(tmp_path, copy_path)
+    copy_configuration = await load_configuration(copy_path / 'automate.yaml')
+    assert copy_configuration.preset_definitions[
+        0].fingerprint == fingerprint
+    (tmp_path / 'p.csv').write_text('x\n1\n3\n')
+    new_configuration = await load_configuration(path)
+    assert get_preset_differences(configuration, new_configuration) == {
+        'added': ['3'], 'removed': ['2'], 'changed': []}
+    (tmp_path / 'run.py').write_text('print(1)')
+    new_configuration = await load_configuration(path)
+    assert new_configuration.preset_definitions[0].fingerprint != fingerprint
+    assert get_preset_differences(configuration, new_configuration) == {
+        'added': ['3'], 'removed': ['2'], 'changed': ['1']}
+
+
+@pytest.mark.asyncio
+async def test_execution_fingerprint(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    text = (
+        f'crosscompute: {PROTOCOL_VERSION}\n'
+        'execution:\n'
+        '  setup:\n'
+        '    root:\n'
+        '      path: setup.sh\n'
+        '  packages:\n'
+        '    - id: {x}\n'
+        '      manager: pip\n'
+        '    - id: {y}\n'
+        '      manager: pip\n')
+    path.write_text(text.replace('{x}', 'a').replace('{y}', 'b'))
+    (tmp_path / 'setup.sh').write_text('')
+    configuration = await load_configuration(path)
+    fingerprint = configuration.execution_definition.fingerprint
+    assert str(tmp_path / 'setup.sh') in [
+        str(_) for _ in configuration.source_paths]
+    path.write_text(text.replace('{x}', 'b').replace('{y}', 'a'))
+    configuration = await load_configuration(path)
+    assert configuration.execution_definition.fingerprint == fingerprint
+    (tmp_path / 'setup.sh').write_text('dnf update')
+    configuration = await load_configuration(path)
+    assert configuration.execution_definition.fingerprint != fingerprint
+
+
+@pytest.mark.asyncio
+async def test_prepared_script(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    path.write_text(
+        f'crosscompute: {PROTOCOL_VERSION}\n'
+        'scripts:\n'
+        '  - path: run.ipynb\n')
+    (tmp_path / 'run.ipynb').write_text('{}')
+    configuration = await load_configuration(path)
+    preparation_map = configuration.script_definitions[0].preparation_map
+    assert not await is_prepared_script(tmp_path, preparation_map)
+    (tmp_path / preparation_map['target_path']).write_text('')
+    await mark_prepared_script(tmp_path, preparation_map)
+    assert await is_prepared_script(tmp_path, preparation_map)
+    (tmp_path / 'run.ipynb').write_text('{"cells": []}')
+    assert not await is_prepared_script(tmp_path, preparation_map)
+
+
+# ruff: noqa: S101
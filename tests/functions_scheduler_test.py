@@ -0,0 +1,60 @@
+import asyncio
+import time
+from threading import Event, Thread
+
+import pytest
+
+from crosscompute_definitions.constant import (
+    IOPriority)
+from crosscompute_definitions.function.scheduler import (
+    IOScheduler,
+    use_io_priority)
+
+
+@pytest.mark.asyncio
+async def test_io_scheduler():
+    io_scheduler = IOScheduler(thread_count=1)
+    event = Event()
+    names = []
+
+    def f(name):
+        if name == 'a':
+            event.wait()
+        names.append(name)
+
+    with use_io_priority(IOPriority.BACKGROUND):
+        tasks = [asyncio.create_task(io_scheduler.run(f, _)) for _ in 'ab']
+    await asyncio.sleep(0.01)
+    tasks.append(asyncio.create_task(io_scheduler.run(f, 'c')))
+    await asyncio.sleep(0.01)
+    event.set()
+    await asyncio.gather(*tasks)
+    assert names == ['a', 'c', 'b']
+
+
+def test_io_scheduler_with_loops():
+    io_scheduler = IOScheduler(thread_count=1)
+    event = Event()
+    names = []
+
+    def f(name):
+        if name == 'a':
+            event.wait()
+        names.append(name)
+
+    async def run(name):
+        await asyncio.wait_for(io_scheduler.run(f, name), 5)
+
+    threads = [Thread(target=asyncio.run, args=(run(_),)) for _ in 'ab']
+    threads[0].start()
+    while not io_scheduler._running_count:  # noqa: SLF001
+        time.sleep(0.01)
+    threads[1].start()
+    time.sleep(0.01)
+    event.set()
+    for thread in threads:
+        thread.join()
+    assert names == ['a', 'b']
+
+
+# ruff: noqa: S101
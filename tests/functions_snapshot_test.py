@@ -0,0 +1,104 @@
+import gzip
+
+import aiofiles
+import pytest
+from crosscompute_views.base import (
+    LoadableVariableView)
+
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION)
+from crosscompute_definitions.error import (
+    CrossComputeDataError)
+from crosscompute_definitions.function.snapshot import (
+    load_configuration_with_snapshot,
+    load_snapshot)
+from crosscompute_definitions.setting import (
+    view_by_name)
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_with_snapshot(tmp_path):
+    path = tmp_path / 'automate.yaml'
+    snapshot_path = tmp_path / 'automate.pickle'
+    text = (
+        f'crosscompute: {PROTOCOL_VERSION}\n'
+        'name: A\n'
+        'output:\n'
+        'presets:\n'
+        '  - folder: p\n')
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(text)
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path)
+    tool_definition = await load_configuration_with_snapshot(
+        path, snapshot_path)
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path)
+    tool_definition = await load_snapshot(snapshot_path, OPTIONS)
+    assert tool_definition.name == 'A'
+    preset_definition = tool_definition.preset_definitions[0]
+    assert preset_definition.tool_definition is tool_definition
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(text.replace('name: A', 'name: BB'))
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path, OPTIONS)
+    tool_definition = await load_configuration_with_snapshot(
+        path, snapshot_path)
+    assert tool_definition.name == 'BB'
+    tool_definition = await load_configuration_with_snapshot(
+        path, snapshot_path, with_disk=False)
+    assert tool_definition.is_partial
+    tool_definition = await load_snapshot(snapshot_path, OPTIONS)
+    assert not tool_definition.is_partial
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path, OPTIONS | {'with_disk': False})
+
+
+@pytest.mark.asyncio
+async def test_load_configuration_with_snapshot_sources(tmp_path, monkeypatch):
+    path = tmp_path / 'automate.yaml'
+    snapshot_path = tmp_path / 'automate.pickle'
+    async with aiofiles.open(path, 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'tools:\n'
+            '  - path: x/automate.yaml\n')
+    (tmp_path / 'x').mkdir()
+    async with aiofiles.open(tmp_path / 'x' / 'automate.yaml', 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'input:\n'
+            '  variables:\n'
+            '    - id: a\n'
+            '      view: number\n'
+            '      path: a.txt\n'
+            'output:\n'
+            'presets:\n'
+            '  - folder: p\n')
+    monkeypatch.setitem(view_by_name, 'number', LoadableVariableView)
+    input_folder = tmp_path / 'x' / 'p' / 'input'
+    input_folder.mkdir(parents=True)
+    data_path = input_folder / 'a.txt.gz'
+    data_path.write_bytes(gzip.compress(b'1'))
+    configuration_path = input_folder / 'a.txt.configuration'
+    configuration_path.write_text('{"x": 1}')
+    tool_definition = await load_configuration_with_snapshot(
+        tmp_path, snapshot_path, with_lazy=True)
+    assert tool_definition.tool_definitions[0].preset_definitions[0].data[
+        'i']['a'] == {'v': '1', 'c': {'x': 1}}
+    tool_definition = await load_snapshot(snapshot_path, OPTIONS)
+    assert tool_definition.tool_definitions[0].execution_definition.engine_name
+    data_path.write_bytes(gzip.compress(b'22'))
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path, OPTIONS)
+    await load_configuration_with_snapshot(tmp_path, snapshot_path)
+    await load_snapshot(snapshot_path, OPTIONS)
+    configuration_path.write_text('{"x": 22}')
+    with pytest.raises(CrossComputeDataError):
+        await load_snapshot(snapshot_path, OPTIONS)
+
+
+OPTIONS = {'locus': '0', 'with_disk': True, 'with_outline': False}
+
+
+# ruff: noqa: S101
@@ -0,0 +1,45 @@
+import aiofiles
+import pytest
+
+from crosscompute_definitions.constant import (
+    PROTOCOL_VERSION)
+from crosscompute_definitions.error import (
+    CrossComputeDataError)
+from crosscompute_definitions.function.configuration import (
+    load_configuration)
+from crosscompute_definitions.function.store import (
+    load_definition_store,
+    save_definition_store)
+
+
+@pytest.mark.asyncio
+async def test_definition_store(tmp_path):
+    async with aiofiles.open(tmp_path / 'automate.yaml', 'wt') as f:
+        await f.write(
+            f'crosscompute: {PROTOCOL_VERSION}\n'
+            'tools:\n'
+            '  - path: a.yaml\n'
+            '  - path: b.yaml\n')
+    for name in 'a', 'b':
+        async with aiofiles.open(tmp_path / f'{name}.yaml', 'wt') as f:
+            await f.write(
+                f'crosscompute: {PROTOCOL_VERSION}\n'
+                f'slug: {name}\n'
+                'output:\n'
+                'presets:\n'
+                '  - folder: p\n')
+    store_path = tmp_path / 'kit.store'
+    kit_definition = await load_configuration(tmp_path)
+    await save_definition_store(store_path, kit_definition)
+    definition_store = await load_definition_store(store_path)
+    assert definition_store.is_current()
+    tool_definition = definition_store.get_tool_definition(tool_slug='b')
+    assert tool_definition.locus == '0-1'
+    assert definition_store.get_tool_definition(
+        tool_locus='0-1') is tool_definition
+    with pytest.raises(CrossComputeDataError):
+        definition_store.get_tool_definition(tool_slug='c')
+    definition_store.close()
+
+
+# ruff: noqa: S101
@@ -1,3 +1,5 @@
+import asyncio
+import gzip
 import json
 
 import aiofiles
@@ -9,9 +11,17 @@ from crosscompute_views.base import (
     initialize_view_by_name)
 
 from crosscompute_definitions.constant import (
-    DATA_VALUE)
+    DATA_PATH,
+    DATA_PREVIEW,
+    DATA_VALUE,
+    RAW_DATA_BYTE_COUNT,
+    DataStatus)
 from crosscompute_definitions.function.variable import (
-    load_variable_data)
+    iterate_indexed_data,
+    load_changed_variable_data_by_id,
+    load_indexed_paths,
+    load_variable_data,
+    load_variable_status_by_id)
 
 
 @pytest.mark.asyncio
@@ -28,4 +38,148 @@ async def test_load_variable_data(tmp_path):
     assert variable_data[DATA_VALUE] == 1
 
 
+@pytest.mark.asyncio
+async def test_load_compressed_variable_data(tmp_path):
+    folder = tmp_path
+    with gzip.open(folder / 'v.dictionary.gz', mode='wt') as f:
+        f.write(json.dumps({'a': 1}))
+    with gzip.open(folder / 'x.txt.gz', mode='wt') as f:
+        f.write('x' * (RAW_DATA_BYTE_COUNT + 1))
+    initialize_view_by_name()
+    variable = Clay(
+        id='a', view_name='number', path_name='v.dictionary',
+        configuration={})
+    variable_data = await load_variable_data(folder, variable)
+    assert variable_data[DATA_VALUE] == 1
+    variable = Clay(
+        id='x', view_name='text', path_name='x.txt', configuration={})
+    variable_data = await load_variable_data(
+        folder, variable, with_configuration_path=False)
+    assert str(variable_data[DATA_PATH]).endswith('x.txt.gz')
+
+
+@pytest.mark.asyncio
+async def test_load_changed_variable_data_by_id(tmp_path):
+    folder = tmp_path
+    (folder / 'a.txt').write_text('a')
+    (folder / 'b.txt').write_text('b')
+    initialize_view_by_name()
+    variables = [Clay(
+        id=_, view_name='text', path_name=f'{_}.txt', configuration={},
+    ) for _ in ['a', 'b']]
+    d = await load_changed_variable_data_by_id(folder, variables)
+    assert d['is_modified']
+    assert d['data_by_id']['b'][DATA_VALUE] == 'b'
+    change_token = d['change_token']
+    d = await load_changed_variable_data_by_id(
+        folder, variables, change_token)
+    assert not d['is_modified']
+    (folder / 'b.txt').write_text('bb')
+    d = await load_changed_variable_data_by_id(
+        folder, variables, change_token)
+    assert d['variable_ids'] == ['b']
+    assert d['data_by_id']['b'][DATA_VALUE] == 'bb'
+
+
+@pytest.mark.asyncio
+async def test_load_variable_data_preview(tmp_path):
+    folder = tmp_path
+    (folder / 'x.txt').write_text('a\nb\nc\n')
+    (folder / 'x.geojson').write_text(json.dumps({
+        'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'id': _} for _ in range(9)]}))
+    initialize_view_by_name()
+    variable = Clay(
+        id='x', view_name='text', path_name='x.txt', configuration={
+            'inline-byte-count': 4, 'preview-line-count': 2})
+    variable_data = await load_variable_data(
+        folder, variable, with_configuration_path=False)
+    assert variable_data[DATA_PREVIEW] == 'a\nb'
+    assert str(variable_data[DATA_PATH]).endswith('x.txt')
+    variable.configuration = {'inline-byte-count': 8}
+    variable_data = await load_variable_data(
+        folder, variable, with_configuration_path=False)
+    assert DATA_PREVIEW not in variable_data
+    variable = Clay(
+        id='x', view_name='map', path_name='x.geojson', configuration={
+            'inline-byte-count': 4, 'preview-byte-count': 100})
+    variable_data = await load_variable_data(
+        folder, variable, with_configuration_path=False)
+    features = variable_data[DATA_PREVIEW]['features']
+    assert 0 < len(features) < 9
+    assert features[0]['id'] == 0
+
+
+@pytest.mark.asyncio
+async def test_load_variable_data_concurrently(tmp_path):
+    folder = tmp_path
+    (folder / 'x.txt').write_text('x')
+
+    class View:
+
+        async def parse(self, value):
+            return value + '!'
+
+    variable = Clay(
+        id='x', view=View(), path_name='x.txt', configuration={})
+    values = [_[DATA_VALUE] for _ in await asyncio.gather(*(
+        load_variable_data(folder, variable) for _ in range(3)))]
+    assert values == ['x!'] * 3
+    variable_data = await load_variable_data(folder, variable)
+    assert variable_data[DATA_VALUE] == 'x!'
+
+@pytest.mark.asyncio
+async def test_load_indexed_paths(tmp_path):
+    folder = tmp_path
+    (folder / 'f').mkdir()
+    for index in [10, 2, 1]:
+        (folder / 'f' / f'x{index}.txt').write_text(str(index))
+    (folder / 'f' / 'xa.txt').write_text('')
+    variable = Clay(id='x', path_name='f/x{index}.txt', configuration={})
+    d = await load_indexed_paths(folder, variable, offset=1, limit=1)
+    assert d['count'] == 3
+    assert d['entries'][0]['index'] == 2
+    assert d['entries'][0]['byte_count'] == 1
+    assert isinstance(d['entries'][0][DATA_PATH], str)
+    (folder / 'f' / 'x2.txt').write_text('22')
+    d = await load_indexed_paths(folder, variable, offset=1, limit=1)
+    assert d['entries'][0]['byte_count'] == 2
+    (folder / 'f' / 'x3.txt').write_text('3')
+    d = await load_indexed_paths(folder, variable)
+    assert [_['index'] for _ in d['entries']] == [1, 2, 3, 10]
+    raw_bytes_list = [raw_bytes async for _, _, raw_bytes in (
+        iterate_indexed_data(folder, variable, offset=3))]
+    assert raw_bytes_list == [b'10']
+
+
+@pytest.mark.asyncio
+async def test_load_variable_status_by_id(tmp_path):
+    folder = tmp_path
+    (folder / 'a.txt').write_text('a')
+    (folder / 'b.json').write_text('{')
+    (folder / 'c.txt').write_text('c' * 9)
+    initialize_view_by_name()
+    variables = [Clay(
+        id=_, view_name='text', path_name=path_name, configuration={
+            'inline-byte-count': 4},
+    ) for _, path_name in [
+        ('a', 'a.txt'), ('b', 'b.json'), ('c', 'c.txt'), ('d', 'd.txt'),
+        ('e', 'e{index}.txt')]]
+    (folder / 'e1.txt').write_text('e')
+    data_by_id, status_by_id = await load_variable_status_by_id(
+        folder, variables)
+    assert status_by_id == {
+        'a': DataStatus.READY,
+        'b': DataStatus.PARSE_ERROR,
+        'c': DataStatus.TOO_LARGE,
+        'd': DataStatus.MISSING,
+        'e': DataStatus.READY}
+    assert data_by_id['a'][DATA_VALUE] == 'a'
+    assert 'd' not in data_by_id
+    (folder / 'd.txt').write_text('d')
+    data_by_id, status_by_id = await load_variable_status_by_id(
+        folder, variables)
+    assert status_by_id['d'] == DataStatus.READY
+
+
 # ruff: noqa: S101
@@ -0,0 +1,28 @@
+import json
+import subprocess
+import sys
+
+
+def test_import_modules():
+    code = (
+        'import json, sys\n'
+        'import crosscompute_definitions.function.configuration\n'
+        'print(json.dumps(sorted(sys.modules)))\n')
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, '-c', code], capture_output=True, check=True,
+        text=True)
+    module_names = json.loads(process.stdout)
+    for module_name in [
+            'aiofiles', 'crosscompute_views', 'packaging', 'ruamel.yaml']:
+        assert module_name not in module_names
+
+
+def test_lazy_names():
+    import crosscompute_definitions  # noqa: PLC0415
+    assert crosscompute_definitions.load_configuration
+    assert crosscompute_definitions.ToolDefinition
+    assert crosscompute_definitions.load_variable_data
+    assert not hasattr(crosscompute_definitions, 'x')
+
+
+# ruff: noqa: S101